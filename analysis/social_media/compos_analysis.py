@@ -88,12 +88,17 @@ def run_compos_analysis(df: pd.DataFrame, text_column: str,
     """
     logger.info(f"Starting CompOS analysis on {len(df)} items...")
     
+    # Identical texts (e.g. ad variants sharing the same copy) are classified once and the label reused
+    texts = df[text_column].tolist()
+    unique_texts = list(dict.fromkeys(texts))
+    logger.info(f"{len(unique_texts)} distinct texts to classify")
+    
     # Prepare data for parallel processing
-    results = []
+    archetypes = [None] * len(unique_texts)
     futures = {}
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for idx, text in enumerate(df[text_column]):
+        for idx, text in enumerate(unique_texts):
             future = executor.submit(assign_archetype, text, idx)
             futures[future] = idx
         
@@ -101,18 +106,16 @@ def run_compos_analysis(df: pd.DataFrame, text_column: str,
         for future in tqdm(as_completed(futures), total=len(futures), desc="Assigning archetypes"):
             try:
                 idx, archetype = future.result()
-                results.append((idx, archetype))
             except Exception as e:
                 idx = futures[future]
                 logger.error(f"Error processing item at index {idx}: {e}")
-                results.append((idx, "Error"))
-    
-    # Sort results by index to maintain order
-    results.sort(key=lambda x: x[0])
+                archetype = "Error"
+            archetypes[idx] = archetype
     
-    # Add archetype column to dataframe
+    # Add archetype column to dataframe, mapping each row's text to its label
+    archetype_by_text = dict(zip(unique_texts, archetypes))
     df_result = df.copy()
-    df_result["Top Archetype"] = [result[1] for result in results]
+    df_result["Top Archetype"] = [archetype_by_text[text] for text in texts]
     
     logger.info("CompOS analysis complete.")
     return df_result
@@ -3,6 +3,7 @@ Configuration file for Monthly Dashboard Analysis
 """
 import os
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any
 
 # Load environment variables from .env file if it exists
@@ -130,6 +131,7 @@ ANALYSIS_TYPES = {
     }
 }
 
+@lru_cache(maxsize=256)
 def get_month_folder_name(year: int, month: int) -> str:
     """Generate folder name in YYYY-MM format"""
     return f"{year}-{month:02d}"
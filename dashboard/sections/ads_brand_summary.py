@@ -9,7 +9,7 @@ import pandas as pd
 import os
 import glob
 from utils.file_io import load_monthly_ads_data, get_selected_date_range, load_creativity_analysis, load_compos_analysis
-from utils.config import BRAND_COLORS, get_brand_column, DATA_ROOT
+from utils.config import BRAND_COLORS, get_brand_column, normalize_brand_series, DATA_ROOT
 
 def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
     """Format a metric card with optional percentage change and ranking."""
@@ -137,8 +137,7 @@ def render():
     df_fixed['brand'] = df_fixed[brand_col]
     
     # Apply brand mapping to normalize brand names
-    from utils.config import normalize_brand_name
-    df_fixed['normalized_brand'] = df_fixed[brand_col].apply(lambda x: normalize_brand_name(x, "ads"))
+    df_fixed['normalized_brand'] = normalize_brand_series(df_fixed[brand_col], "ads")
     
 
     # Compute 6-month reach totals and ranks using normalized brands
@@ -226,8 +225,7 @@ def render():
                 # Creativity
                 with col3:
                     # Use creativity-specific brand mapping for matching
-                    from utils.config import normalize_brand_name
-                    normalized_creativity_brands = creativity_df['brand'].apply(lambda x: normalize_brand_name(x, "ads", is_creativity_data=True)) if not creativity_df.empty else pd.Series()
+                    normalized_creativity_brands = normalize_brand_series(creativity_df['brand'], "ads", is_creativity_data=True) if not creativity_df.empty else pd.Series()
                     cre_row = creativity_df[normalized_creativity_brands == brand_name] if not creativity_df.empty else pd.DataFrame()
                     if not cre_row.empty:
                         score = cre_row['originality_score'].iloc[0]
@@ -246,7 +244,7 @@ def render():
                 # Creativity Analysis section
                 if not creativity_df.empty:
                     # Use creativity-specific brand mapping for matching
-                    normalized_creativity_brands = creativity_df['brand'].apply(lambda x: normalize_brand_name(x, "ads", is_creativity_data=True))
+                    normalized_creativity_brands = normalize_brand_series(creativity_df['brand'], "ads", is_creativity_data=True)
                     cre_row = creativity_df[normalized_creativity_brands == brand_name]
                     if not cre_row.empty:
                         score = cre_row['originality_score'].iloc[0]
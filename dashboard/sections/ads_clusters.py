@@ -7,7 +7,7 @@ Shows top 3 clusters by reach for the selected month
 import streamlit as st
 import pandas as pd
 from utils.file_io import load_monthly_ads_data, get_selected_date_range
-from utils.config import normalize_brand_name, get_brand_column
+from utils.config import normalize_brand_series, get_brand_column
 
 def create_cluster_card_with_examples(cluster_name, ads_count, total_reach, examples):
     """Create a card-style display for a cluster with examples"""
@@ -70,7 +70,7 @@ def render():
     
     # Always normalize company names for display
     brand_col = get_brand_column("ads")
-    df_filtered['normalized_brand'] = df_filtered[brand_col].apply(lambda x: normalize_brand_name(x, "ads"))
+    df_filtered = df_filtered.assign(normalized_brand=normalize_brand_series(df_filtered[brand_col], "ads"))
     
     # Get selected brands from session state and filter
     selected_brands = st.session_state.get("selected_brands", [])
@@ -57,8 +57,8 @@ def render():
     brand_counts = df_filtered[brand_col].value_counts() if brand_col in df_filtered.columns else pd.Series()
     
     # Apply brand mapping to normalize brand names
-    from utils.config import normalize_brand_name
-    df_filtered['normalized_brand'] = df_filtered[brand_col].apply(lambda x: normalize_brand_name(x, "ads"))
+    from utils.config import normalize_brand_series
+    df_filtered['normalized_brand'] = normalize_brand_series(df_filtered[brand_col], "ads")
     
     # Filter by selected brands from session state
     selected_brands = st.session_state.get("selected_brands", [])
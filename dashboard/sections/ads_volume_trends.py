@@ -64,8 +64,8 @@ def render():
     df_fixed['brand'] = df_fixed[brand_col]
     
     # Apply brand mapping to normalize brand names
-    from utils.config import normalize_brand_name
-    df_fixed['normalized_brand'] = df_fixed[brand_col].apply(lambda x: normalize_brand_name(x, "ads"))
+    from utils.config import normalize_brand_series
+    df_fixed['normalized_brand'] = normalize_brand_series(df_fixed[brand_col], "ads")
     
     
     # Filter by selected brands from session state
@@ -1,7 +1,7 @@
 import streamlit as st
 import plotly.express as px
-from utils.file_io import load_monthly_pr_data
-from utils.config import BRANDS, normalize_brand_name
+from utils.file_io import load_monthly_pr_data, slice_date_range
+from utils.config import BRANDS, normalize_brand_name, normalize_brand_series
 import pandas as pd
 from utils.date_utils import get_selected_date_range  # Add this import
 
@@ -32,7 +32,7 @@ def render():
     
     # Filter data for the selected date range
     start_date, end_date = get_selected_date_range()
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    df_filtered = slice_date_range(df, start_date, end_date)
     
     # Create summary in original format
     summary = {}
@@ -43,7 +43,7 @@ def render():
     # Filter by selected brands using normalized names
     if selected_brands:
         # Normalize the company names in the data and filter
-        df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
+        df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered['company'], "pr"))
         df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
     
     # Get unique companies from the filtered data
@@ -5,8 +5,8 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime
 from utils.date_utils import get_selected_date_range
-from utils.file_io import load_monthly_ads_data, load_monthly_social_media_data, load_monthly_pr_data, load_creativity_analysis, load_compos_analysis
-from utils.config import BRAND_COLORS, BRANDS, normalize_brand_name, get_brand_column
+from utils.file_io import load_monthly_ads_data, load_selected_social_media_data, load_monthly_pr_data, load_creativity_analysis, load_compos_analysis
+from utils.config import BRAND_COLORS, BRANDS, normalize_brand_series, get_brand_column
 
 def _format_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
     """Format a metric card with optional percentage change and ranking"""
@@ -69,7 +69,7 @@ def render_ads_metrics():
         return
     
     # Normalize brand names
-    df_ads["normalized_brand"] = df_ads[brand_col].apply(lambda x: normalize_brand_name(x, "ads"))
+    df_ads["normalized_brand"] = normalize_brand_series(df_ads[brand_col], "ads")
     
     # Get selected brands
     selected_brands = st.session_state.get("selected_brands", [])
@@ -197,35 +197,17 @@ def render_social_media_metrics():
     """Render social media metrics section"""
     st.subheader("📱 Social Media Metrics")
     
-    # Load social media data
-    df_social = load_monthly_social_media_data()
+    # Load social media data for the selected period and brands (shared with the other social sections)
+    df_social = load_selected_social_media_data()
     if df_social is None or df_social.empty:
-        st.info("No social media data available.")
-        return
-    
-    # Get the correct brand column for social media
-    brand_col = get_brand_column("social_media")
-    if brand_col not in df_social.columns:
-        st.error(f"Brand column '{brand_col}' not found in social media data. Available columns: {list(df_social.columns)}")
-        return
-    
-    # Normalize brand names
-    df_social["normalized_brand"] = df_social[brand_col].apply(lambda x: normalize_brand_name(x, "social_media"))
-    
-    # Get selected brands
-    selected_brands = st.session_state.get("selected_brands", [])
-    if selected_brands:
-        df_social = df_social[df_social["normalized_brand"].isin(selected_brands)]
-    
-    if df_social.empty:
         st.info("No social media data available for selected brands.")
         return
     
     # Calculate engagement metrics (using likes as reach proxy)
     if "likes" in df_social.columns:
-        engagement_totals = df_social.groupby("normalized_brand", as_index=False)["likes"].sum()
+        engagement_totals = df_social.groupby("normalized_company", as_index=False)["likes"].sum()
         engagement_mean = engagement_totals["likes"].mean() if not engagement_totals.empty else 0
-        engagement_ranks = engagement_totals.set_index("normalized_brand")["likes"].rank(ascending=False, method="min")
+        engagement_ranks = engagement_totals.set_index("normalized_company")["likes"].rank(ascending=False, method="min")
     else:
         engagement_totals = pd.DataFrame()
         engagement_mean = 0
@@ -238,7 +220,7 @@ def render_social_media_metrics():
     compos_df = load_compos_analysis("social_media")
     
     # Create brand tabs
-    available_brands = sorted(df_social["normalized_brand"].unique())
+    available_brands = sorted(df_social["normalized_company"].unique())
     if not available_brands:
         st.info("No brands available to display.")
         return
@@ -359,7 +341,7 @@ def render_pr_metrics():
         return
     
     # Normalize brand names
-    df_pr["normalized_brand"] = df_pr[brand_col].apply(lambda x: normalize_brand_name(x, "pr"))
+    df_pr["normalized_brand"] = normalize_brand_series(df_pr[brand_col], "pr")
     
     # Get selected brands
     selected_brands = st.session_state.get("selected_brands", [])
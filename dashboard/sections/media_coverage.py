@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.file_io import load_monthly_pr_data
+from utils.file_io import load_monthly_pr_data, slice_date_range
 from utils.date_utils import get_selected_date_range
-from utils.config import BRANDS, BRAND_COLORS, normalize_brand_name  # <-- add BRAND_COLORS
+from utils.config import BRANDS, BRAND_COLORS, normalize_brand_series  # <-- add BRAND_COLORS
 
 REGIONS = {
     "Total": None,
@@ -57,14 +57,14 @@ def render(mode: str = "by_brand"):
     start_date, end_date = get_selected_date_range()
     
     # Filter data by date range
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    df_filtered = slice_date_range(df, start_date, end_date)
     
     # Get selected brands from session state and filter
     selected_brands = st.session_state.get("selected_brands", [])
     
     if selected_brands:
         # Normalize the company names in the data and filter
-        df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
+        df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered['company'], "pr"))
         df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
     
     if df_filtered.empty:
@@ -73,7 +73,7 @@ def render(mode: str = "by_brand"):
 
     # Use the filtered data directly
     df_all = df_filtered.copy()
-    df_all["Company"] = df_all["company"].apply(lambda x: normalize_brand_name(x, "pr"))  # Map company to normalized Company for compatibility
+    df_all["Company"] = normalize_brand_series(df_all["company"], "pr")  # Map company to normalized Company for compatibility
 
     if mode == "by_brand":
         tabs = st.tabs(["📰 Coverage", "📢 Reach"])
@@ -5,12 +5,31 @@ Shows top 3 archetypes by company from PR data
 """
 
 import streamlit as st
-import pandas as pd
 import os
-from utils.file_io import load_monthly_pr_data, get_selected_date_range
-from utils.config import normalize_brand_name, DATA_ROOT
+import heapq
+import operator
+from string import Template
+from utils.file_io import load_monthly_pr_data, get_selected_date_range, get_monthly_data_mtime, read_excel_via_parquet, slice_date_range
+from utils.config import normalize_brand_name, normalize_brand_series, DATA_ROOT
 
-def _load_top_archetypes_from_pr_data():
+_CARD_TPL = Template(
+    '<div style="flex:0 0 calc((100% - 24px) / 3); border:1px solid #ddd; border-radius:10px; padding:10px; margin-bottom:10px; text-align:center;">'
+    '<h4 style="margin:0; color:#333;">$arch</h4>'
+    '<h2 style="margin:5px 0; color:#333; font-size:2.0em;">$pct%</h2>'
+    '<p style="margin:0; color:#666; font-size:0.9em;">$cnt items</p>'
+    '</div>'
+)
+
+def _render_top3(subtitle, items):
+    """Render a subheader and a single row of up to three archetype cards."""
+    cards = "".join(
+        _CARD_TPL.substitute(arch=item['archetype'], pct=f"{item['percentage']:.1f}", cnt=item['count'])
+        for item in items
+    )
+    st.subheader(subtitle)
+    st.markdown(f'<div style="display:flex; gap:12px;">{cards}</div>', unsafe_allow_html=True)
+
+def _load_top_archetypes_from_pr_data(selected_brands, start_date, end_date):
     """Load top archetypes from PR master data."""
     try:
         # Load PR data
@@ -19,44 +38,39 @@ def _load_top_archetypes_from_pr_data():
             return {}
         
         # Filter data for the selected date range
-        start_date, end_date = get_selected_date_range()
-        df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-        
-        # Get selected brands from session state
-        selected_brands = st.session_state.get("selected_brands", [])
+        df_filtered = slice_date_range(df, start_date, end_date)
         
         # Filter by selected brands using normalized names
         if selected_brands:
             # Normalize the company names in the data and filter
-            df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
+            df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered['company'], "pr"))
             df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
         
         # Check if the data has a 'Top Archetype' column
         if 'Top Archetype' not in df_filtered.columns:
             return {}
         
-        archetypes = {}
+        # Drop rows without a company once instead of checking each company in the loop
+        df_filtered = df_filtered.dropna(subset=['company'])
         
-        # Get unique companies from the filtered data
-        companies = df_filtered['company'].unique()
+        archetypes = {}
         
-        for company in companies:
-            if pd.notna(company):
-                company_df = df_filtered[df_filtered['company'] == company]
-                archetype_counts = company_df['Top Archetype'].value_counts()
-                total_ads = len(company_df)
+        # Partition the filtered data by company once, in order of appearance
+        for company, company_df in df_filtered.groupby('company', sort=False, observed=True):
+            archetype_counts = company_df['Top Archetype'].value_counts()
+            total_ads = len(company_df)
+            
+            if total_ads > 0:
+                # Get top 3 archetypes
+                top3 = archetype_counts.head(3)
+                items = []
+                for archetype, count in top3.items():
+                    pct = (count / total_ads) * 100
+                    items.append({'archetype': archetype, 'percentage': pct, 'count': int(count)})
                 
-                if total_ads > 0:
-                    # Get top 3 archetypes
-                    top3 = archetype_counts.head(3)
-                    items = []
-                    for archetype, count in top3.items():
-                        pct = (count / total_ads) * 100
-                        items.append({'archetype': archetype, 'percentage': pct, 'count': int(count)})
-                    
-                    if items:
-                        normalized_brand = normalize_brand_name(company, "pr")
-                        archetypes[normalized_brand] = items
+                if items:
+                    normalized_brand = normalize_brand_name(company, "pr")
+                    archetypes[normalized_brand] = items
         
         return archetypes
     except Exception:
@@ -76,7 +90,7 @@ def _load_top_archetypes_from_compos():
         return {}
     
     try:
-        df = pd.read_excel(compos_analysis_path)
+        df = read_excel_via_parquet(compos_analysis_path)
         archetypes = {}
         
         # Check if the data has a 'Top Archetype' column (from compos analysis)
@@ -91,93 +105,80 @@ def _load_top_archetypes_from_compos():
                     break
             
             if brand_col:
+                # Drop rows without a brand once instead of checking each brand in the loop
+                df = df.dropna(subset=[brand_col])
+                
                 # Group by brand and get top 3 archetypes for each brand
-                for brand in df[brand_col].unique():
-                    if pd.notna(brand):
-                        brand_data = df[df[brand_col] == brand]
-                        archetype_counts = brand_data['Top Archetype'].value_counts()
-                        total_ads = len(brand_data)
+                for brand, brand_data in df.groupby(brand_col, sort=False):
+                    archetype_counts = brand_data['Top Archetype'].value_counts()
+                    total_ads = len(brand_data)
+                    
+                    if total_ads > 0:
+                        # Get top 3 archetypes
+                        top3 = archetype_counts.head(3)
+                        items = []
+                        for archetype, count in top3.items():
+                            pct = (count / total_ads) * 100
+                            items.append({'archetype': archetype, 'percentage': pct, 'count': int(count)})
                         
-                        if total_ads > 0:
-                            # Get top 3 archetypes
-                            top3 = archetype_counts.head(3)
-                            items = []
-                            for archetype, count in top3.items():
-                                pct = (count / total_ads) * 100
-                                items.append({'archetype': archetype, 'percentage': pct, 'count': int(count)})
-                            
-                            if items:
-                                normalized_brand = normalize_brand_name(brand, "pr")
-                                archetypes[normalized_brand] = items
+                        if items:
+                            normalized_brand = normalize_brand_name(brand, "pr")
+                            archetypes[normalized_brand] = items
         return archetypes
     except Exception:
         return {}
 
-def render():
-    """Render the top archetypes by company section."""
-    st.markdown("### Top Archetypes by Company")
-    
-    archetypes_data = _load_top_archetypes_from_pr_data()
+@st.cache_data(show_spinner=False)
+def _compute_archetype_payload(selected_brands: tuple, start_date, end_date, mtime: tuple):
+    """Compute per-brand and overall top archetypes; cached on selection, date range and data mtime."""
+    archetypes_data = _load_top_archetypes_from_pr_data(list(selected_brands), start_date, end_date)
     if not archetypes_data:
         archetypes_data = _load_top_archetypes_from_compos()
     
-    # Filter by selected brands from session state
-    selected_brands = st.session_state.get("selected_brands", [])
-    
     if selected_brands and archetypes_data:
         # Filter archetypes data to only include selected brands
         archetypes_data = {brand: data for brand, data in archetypes_data.items() if brand in selected_brands}
     
-    if archetypes_data:
-        # Compute overall top archetypes
-        overall_counts = {}
-        overall_total = 0
-        for archetypes in archetypes_data.values():
-            for item in archetypes:
-                archetype = item['archetype']
-                count = item['count']
-                overall_counts[archetype] = overall_counts.get(archetype, 0) + count
-                overall_total += count
-        
-        overall_top3 = sorted(overall_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-        overall_items = []
-        for archetype, count in overall_top3:
-            pct = (count / overall_total) * 100 if overall_total > 0 else 0
-            overall_items.append({'archetype': archetype, 'percentage': pct, 'count': count})
+    # Compute overall top archetypes
+    overall_counts = {}
+    overall_total = 0
+    for archetypes in archetypes_data.values():
+        for item in archetypes:
+            archetype = item['archetype']
+            count = item['count']
+            overall_counts[archetype] = overall_counts.get(archetype, 0) + count
+            overall_total += count
+    
+    overall_top3 = heapq.nlargest(3, overall_counts.items(), key=operator.itemgetter(1))
+    overall_items = []
+    for archetype, count in overall_top3:
+        pct = (count / overall_total) * 100 if overall_total > 0 else 0
+        overall_items.append({'archetype': archetype, 'percentage': pct, 'count': count})
+    
+    return {'per_brand': archetypes_data, 'overall': overall_items}
 
+def render():
+    """Render the top archetypes by company section."""
+    st.markdown("### Top Archetypes by Company")
+    
+    start_date, end_date = get_selected_date_range()
+    selected_brands = tuple(st.session_state.get("selected_brands", []))
+    payload = _compute_archetype_payload(selected_brands, start_date, end_date, get_monthly_data_mtime("pr"))
+    archetypes_data = payload['per_brand']
+    overall_items = payload['overall']
+    
+    if archetypes_data:
         tab_labels = ["🌍 Overall"] + list(archetypes_data.keys())
         company_tabs = st.tabs(tab_labels)
         
         # Overall tab
         with company_tabs[0]:
-            st.subheader("Overall - Top 3 Archetypes")
-            col1, col2, col3 = st.columns(3)
-            for j, archetype_info in enumerate(overall_items):
-                col = col1 if j == 0 else col2 if j == 1 else col3
-                with col:
-                    st.markdown(f"""
-                    <div style="border:1px solid #ddd; border-radius:10px; padding:10px; margin-bottom:10px; text-align:center;">
-                        <h4 style="margin:0; color:#333;">{archetype_info['archetype']}</h4>
-                        <h2 style="margin:5px 0; color:#333; font-size:2.0em;">{archetype_info['percentage']:.1f}%</h2>
-                        <p style="margin:0; color:#666; font-size:0.9em;">{archetype_info['count']} items</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            _render_top3("Overall - Top 3 Archetypes", overall_items)
         
         # Company tabs
         for i, (company, archetypes) in enumerate(archetypes_data.items()):
             with company_tabs[i + 1]:
-                st.subheader(f"{company} - Top 3 Archetypes")
-                col1, col2, col3 = st.columns(3)
-                for j, archetype_info in enumerate(archetypes):
-                    col = col1 if j == 0 else col2 if j == 1 else col3
-                    with col:
-                        st.markdown(f"""
-                        <div style="border:1px solid #ddd; border-radius:10px; padding:10px; margin-bottom:10px; text-align:center;">
-                            <h4 style="margin:0; color:#333;">{archetype_info['archetype']}</h4>
-                            <h2 style="margin:5px 0; color:#333; font-size:2.0em;">{archetype_info['percentage']:.1f}%</h2>
-                            <p style="margin:0; color:#666; font-size:0.9em;">{archetype_info['count']} items</p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                _render_top3(f"{company} - Top 3 Archetypes", archetypes)
     else:
         st.info("No archetype data available. Ensure PR master data files contain 'Top Archetype' column or compos analysis files are available.")
 
@@ -8,8 +8,10 @@ import streamlit as st
 import pandas as pd
 import os
 import glob
-from utils.file_io import load_monthly_pr_data, get_selected_date_range, load_creativity_analysis, load_compos_analysis
-from utils.config import normalize_brand_name, get_brand_column
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.file_io import load_monthly_pr_data, get_selected_date_range, load_creativity_analysis, load_compos_analysis, get_monthly_data_mtime, slice_date_range
+from utils.config import normalize_brand_name, normalize_brand_series, get_brand_column
 
 def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
     """Format a metric card with optional percentage change and ranking."""
@@ -39,6 +41,30 @@ def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=
         unsafe_allow_html=True,
     )
 
+def _pct_delta(value, mean):
+    """Percentage difference of a value from the mean (0 when the mean is 0)."""
+    return 0.0 if mean == 0 else (value - mean) / mean * 100.0
+
+def _rank_of(ranks, brand):
+    """Integer rank of a brand, or None if the brand is not ranked."""
+    return int(ranks[brand]) if brand in ranks.index else None
+
+@st.cache_data(show_spinner=False)
+def _load_pr_metric_frame(start_date, end_date, mtime: tuple):
+    """PR master data reduced to the columns the ranking metrics need, shared by reach and brand strength; cached on date range and data mtime."""
+    df = load_monthly_pr_data()
+    if df is None or df.empty:
+        return pd.DataFrame()
+    
+    brand_col = get_brand_column("pr")
+    columns = [col for col in ['date', brand_col, 'reach', 'Top Archetype'] if col in df.columns]
+    df = df[columns].copy()
+    if 'reach' in df.columns:
+        # Whole-number reach is downcast to the smallest integer type that holds it (groupby sums still
+        # accumulate in int64); fractional values keep the float dtype, so nothing is truncated
+        df['reach'] = pd.to_numeric(pd.to_numeric(df['reach'], errors='coerce').fillna(0), downcast='integer')
+    return df
+
 def _load_creativity_data():
     """Load creativity analysis data for PR - ONLY from selected month, no fallbacks."""
     try:
@@ -47,11 +73,11 @@ def _load_creativity_data():
             # Handle different column names between old and new formats
             if 'brand' in creativity_data.columns:
                 # New format (September 2025+)
-                creativity_data['normalized_brand'] = creativity_data['brand'].apply(lambda x: normalize_brand_name(x, "pr"))
+                creativity_data['normalized_brand'] = normalize_brand_series(creativity_data['brand'], "pr")
             elif 'Company' in creativity_data.columns:
                 # Old format (August 2025 and earlier)
                 creativity_data['brand'] = creativity_data['Company']  # Standardize to 'brand'
-                creativity_data['normalized_brand'] = creativity_data['brand'].apply(lambda x: normalize_brand_name(x, "pr"))
+                creativity_data['normalized_brand'] = normalize_brand_series(creativity_data['brand'], "pr")
             else:
                 # No brand column found
                 return pd.DataFrame()
@@ -61,25 +87,19 @@ def _load_creativity_data():
         print(f"Error in _load_creativity_data: {e}")  # Debug print
         return pd.DataFrame()
 
-def _load_brand_strength_data():
-    """Load brand strength from PR master data, calculating percentage of dominant archetype per brand (same as Volume vs Quality matrix)."""
+def _load_brand_strength_data(df, selected_brands, start_date, end_date):
+    """Brand strength from the PR metric frame, calculating percentage of dominant archetype per brand (same as Volume vs Quality matrix)."""
     try:
-        # Load PR data (same as Volume vs Quality matrix)
-        df = load_monthly_pr_data()
         if df is None or df.empty:
             return {}
         
         # Filter data for the selected date range (same as Volume vs Quality matrix)
-        start_date, end_date = get_selected_date_range()
-        df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-        
-        # Get selected brands from session state (same as Volume vs Quality matrix)
-        selected_brands = st.session_state.get("selected_brands", [])
+        df_filtered = slice_date_range(df, start_date, end_date)
         
         # Filter by selected brands using normalized names (same as Volume vs Quality matrix)
         if selected_brands:
             # Normalize the company names in the data and filter
-            df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
+            df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered['company'], "pr"))
             df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
         
         # Get unique companies from the filtered data (same as Volume vs Quality matrix)
@@ -106,12 +126,10 @@ def _load_brand_strength_data():
     except Exception:
         return {}
 
-def _compute_pr_reach_totals():
-    """Compute total impressions (reach) for each brand from PR data."""
+def _compute_pr_reach_totals(df, selected_brands, start_date, end_date):
+    """Compute total impressions (reach) for each brand from the PR metric frame."""
     reach_totals = {}
     
-    # Load PR data
-    df = load_monthly_pr_data()
     if df is None or df.empty:
         return reach_totals
     
@@ -123,17 +141,14 @@ def _compute_pr_reach_totals():
     #     st.write(f"Reach column stats: min={df['reach'].min()}, max={df['reach'].max()}, sum={df['reach'].sum()}")
     
     # Filter by date range
-    start_date, end_date = get_selected_date_range()
     if df['date'].dt.tz is not None:
         start_date = pd.Timestamp(start_date).tz_localize('UTC')
         end_date = pd.Timestamp(end_date).tz_localize('UTC')
     
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    df_filtered = slice_date_range(df, start_date, end_date)
     # st.write(f"Rows after date filtering: {len(df_filtered)}")
     
-    # Get selected brands from session state and filter
-    selected_brands = st.session_state.get("selected_brands", [])
-    
+    # Filter by selected brands
     if selected_brands:
         # Get the correct brand column for PR
         brand_col = get_brand_column("pr")
@@ -144,7 +159,7 @@ def _compute_pr_reach_totals():
         # st.write(f"Unique brands in data: {df_filtered[brand_col].unique().tolist()}")
         
         # Normalize the company names in the data and filter
-        df_filtered['normalized_company'] = df_filtered[brand_col].apply(lambda x: normalize_brand_name(x, "pr"))
+        df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered[brand_col], "pr"))
         
         # st.write(f"Normalized companies: {df_filtered['normalized_company'].unique().tolist()}")
         # st.write(f"Selected brands: {selected_brands}")
@@ -163,7 +178,7 @@ def _compute_pr_reach_totals():
         
         # # Show reach values by raw brand name
         # st.write("🔍 Debug - Reach by raw brand name:")
-        reach_by_raw_brand = df_filtered.groupby(brand_col)['reach'].sum()
+        reach_by_raw_brand = df_filtered.groupby(brand_col, observed=True)['reach'].sum()
         # st.write(reach_by_raw_brand.to_dict())
         
         # # Show reach values by normalized brand name
@@ -182,25 +197,64 @@ def _compute_pr_reach_totals():
     
     return reach_totals
 
+@st.cache_data(show_spinner=False)
+def _compute_metrics_payload(selected_brands: tuple, start_date, end_date, mtime: tuple):
+    """Load the three PR metrics and their means/ranks; cached on selection, date range and data mtime."""
+    selected_brands = list(selected_brands)
+    
+    # One reduced PR frame feeds both the reach and the brand strength computation
+    pr_df = _load_pr_metric_frame(start_date, end_date, mtime)
+    
+    # The three loaders are independent, so run them concurrently.
+    # Worker threads get the script run context so session state and caching work.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        reach_future = executor.submit(_compute_pr_reach_totals, pr_df, selected_brands, start_date, end_date)
+        strength_future = executor.submit(_load_brand_strength_data, pr_df, selected_brands, start_date, end_date)
+        creativity_future = executor.submit(_load_creativity_data)
+        reach_totals = reach_future.result()
+        strength_data = strength_future.result()
+        creativity_data = creativity_future.result()
+    
+    # Creativity score per brand (first score in case of duplicates)
+    creativity_scores = pd.Series(dtype=float)
+    if not creativity_data.empty and 'normalized_brand' in creativity_data.columns and 'originality_score' in creativity_data.columns:
+        creativity_scores = creativity_data.groupby('normalized_brand')['originality_score'].first()
+    
+    # Calculate rankings and means on one brand-aligned frame; brands missing a metric are NaN and skipped
+    metrics = pd.DataFrame({
+        'reach': pd.Series(reach_totals, dtype=float),
+        'strength': pd.Series(strength_data, dtype=float),
+        'creativity': pd.to_numeric(creativity_scores, errors='coerce'),
+    })
+    means = metrics.mean().fillna(0)
+    ranks = metrics.rank(ascending=False, method="min")
+    
+    return {
+        'reach_totals': reach_totals,
+        'strength_data': strength_data,
+        'creativity_data': creativity_data,
+        'means': means,
+        'ranks': ranks,
+    }
+
 def render():
     """Render the PR ranking metrics section."""
     st.markdown("### 📊 PR Performance Metrics")
     
-    # Load data
-    reach_totals = _compute_pr_reach_totals()
-    strength_data = _load_brand_strength_data()
-    creativity_data = _load_creativity_data()
-    
-    # # Debug: Show what data was loaded
-    # st.write("🔍 Debug - PR Data Loading:")
-    # st.write(f"Reach totals: {reach_totals}")
-    # st.write(f"Strength data: {strength_data}")
-    # st.write(f"Creativity data shape: {creativity_data.shape if not creativity_data.empty else 'Empty'}")
-    # if not creativity_data.empty:
-    #     st.write(f"Creativity brands: {creativity_data['brand'].unique().tolist()}")
-    
     # Get selected brands from session state (the "subset of companies")
     selected_brands = st.session_state.get("selected_brands", [])
+    start_date, end_date = get_selected_date_range()
+    
+    # Load data
+    payload = _compute_metrics_payload(tuple(selected_brands), start_date, end_date, get_monthly_data_mtime("pr"))
+    reach_totals = payload['reach_totals']
+    strength_data = payload['strength_data']
+    creativity_data = payload['creativity_data']
+    means, ranks = payload['means'], payload['ranks']
+    reach_mean, reach_ranks = means['reach'], ranks['reach'].dropna()
+    strength_mean, strength_ranks = means['strength'], ranks['strength'].dropna()
+    creativity_mean, creativity_ranks = means['creativity'], ranks['creativity'].dropna()
     
     # Only show brands that are both selected AND have data
     available_brands = set(reach_totals.keys()) | set(strength_data.keys())
@@ -211,31 +265,10 @@ def render():
     available_brands = [brand for brand in available_brands if brand in selected_brands]
     available_brands = sorted(available_brands)
     
-    # st.write(f"🔍 Debug - Selected brands: {selected_brands}")
-    # st.write(f"🔍 Debug - Available brands with data: {available_brands}")
-    
     if not available_brands:
         st.info("No PR data available for the selected companies.")
         return
     
-    # Calculate rankings and means
-    reach_series = pd.Series(reach_totals)
-    reach_mean = reach_series.mean() if len(reach_series) else 0
-    reach_ranks = reach_series.rank(ascending=False, method="min") if len(reach_series) else pd.Series(dtype=float)
-    
-    strength_series = pd.Series(strength_data)
-    strength_mean = strength_series.mean() if len(strength_series) else 0
-    strength_ranks = strength_series.rank(ascending=False, method="min") if len(strength_series) else pd.Series(dtype=float)
-    
-    # Calculate creativity mean and rankings
-    creativity_mean = 0
-    creativity_ranks = pd.Series(dtype=float)
-    if not creativity_data.empty and 'normalized_brand' in creativity_data.columns and 'originality_score' in creativity_data.columns:
-        # Group by normalized_brand and take the first score for each brand (in case of duplicates)
-        creativity_scores = creativity_data.groupby('normalized_brand')['originality_score'].first()
-        creativity_mean = creativity_scores.mean() if len(creativity_scores) else 0
-        creativity_ranks = creativity_scores.rank(ascending=False, method="min") if len(creativity_scores) else pd.Series(dtype=float)
-    
     # Create brand tabs
     brand_tabs = st.tabs(available_brands)
     for i, brand_name in enumerate(available_brands):
@@ -245,28 +278,24 @@ def render():
             # PR Reach (Impressions)
             with col1:
                 total_reach = int(reach_totals.get(brand_name, 0))
-                delta_mean_pct = ((total_reach - (reach_mean if reach_mean != 0 else 1)) / (reach_mean if reach_mean != 0 else 1)) * 100 if reach_mean != 0 else 0
-                rank_now = reach_ranks.get(brand_name, None) if len(reach_ranks) else None
                 _format_simple_metric_card(
                     label="Impressions",
                     val=f"{total_reach:,}",
-                    pct=delta_mean_pct,
-                    rank_now=rank_now,
-                    total_ranks=len(reach_ranks) if len(reach_ranks) else None
+                    pct=_pct_delta(total_reach, reach_mean),
+                    rank_now=_rank_of(reach_ranks, brand_name),
+                    total_ranks=len(reach_ranks) or None
                 )
             
             # Brand Strength
             with col2:
                 if brand_name in strength_data:
                     strength = float(strength_data[brand_name])
-                    rank_bs = int(strength_ranks.get(brand_name, 0))
-                    delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
                     _format_simple_metric_card(
                         label="Brand Strength",
                         val=f"{strength:.1f}%",
-                        pct=delta_bs,
-                        rank_now=rank_bs,
-                        total_ranks=len(strength_ranks)
+                        pct=_pct_delta(strength, strength_mean),
+                        rank_now=_rank_of(strength_ranks, brand_name),
+                        total_ranks=len(strength_ranks) or None
                     )
                 else:
                     _format_simple_metric_card("Brand Strength", "N/A")
@@ -277,14 +306,12 @@ def render():
                     brand_creativity = creativity_data[creativity_data['normalized_brand'] == brand_name]
                     if not brand_creativity.empty:
                         score = brand_creativity.iloc[0].get('originality_score', 0)
-                        rank_cre = int(creativity_ranks[brand_name]) if brand_name in creativity_ranks and len(creativity_ranks) else None
-                        delta_cre = ((score - (creativity_mean if creativity_mean != 0 else 1)) / (creativity_mean if creativity_mean != 0 else 1)) * 100 if creativity_mean != 0 else 0
                         _format_simple_metric_card(
                             label="Creativity",
                             val=f"{score:.2f}",
-                            pct=delta_cre,
-                            rank_now=rank_cre,
-                            total_ranks=len(creativity_ranks) if len(creativity_ranks) else None
+                            pct=_pct_delta(score, creativity_mean),
+                            rank_now=_rank_of(creativity_ranks, brand_name),
+                            total_ranks=len(creativity_ranks) or None
                         )
                     else:
                         _format_simple_metric_card("Creativity", "N/A")
@@ -296,7 +323,7 @@ def render():
                 brand_creativity = creativity_data[creativity_data['normalized_brand'] == brand_name]
                 if not brand_creativity.empty:
                     score = brand_creativity.iloc[0].get('originality_score', 0)
-                    rank_cre = int(creativity_ranks[brand_name]) if brand_name in creativity_ranks and len(creativity_ranks) else None
+                    rank_cre = _rank_of(creativity_ranks, brand_name)
                     just_text = str(brand_creativity.iloc[0].get('justification', '')) if pd.notna(brand_creativity.iloc[0].get('justification', '')) else ""
                     examples_text = str(brand_creativity.iloc[0].get('examples', '')) if pd.notna(brand_creativity.iloc[0].get('examples', '')) else ""
                     
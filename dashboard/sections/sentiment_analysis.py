@@ -1,9 +1,32 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.file_io import load_monthly_pr_data
+from utils.file_io import load_monthly_pr_data, slice_date_range
 from utils.date_utils import get_selected_date_range
-from utils.config import BRANDS, normalize_brand_name
+from utils.config import BRANDS, normalize_brand_name, normalize_brand_series
+
+# Static notes for the Artea expander, built once at import
+_SHOW_ARTEA_TOPICS = "Artea" in BRANDS
+_ARTEA_NEGATIVE_MD = """
+- **Client frustrations with Artea (multiple cases)**
+  - Unexpected bank fees on account balances.
+  - Complaints spreading on social media about poor treatment of customers.
+  - These are reputational hits tied to service quality and fee transparency.
+- **Broader financial/economic pressure**
+  - Tax changes and economic downturn discussions reflect negatively on banks, with Artea mentioned as an example.
+  - Suggests an association with systemic financial stress, not necessarily misconduct by the bank itself.
+- **Fraud and scams targeting customers**
+  - Several stories about scams and fraud attempts, where criminals impersonated or exploited Artea/Šiaulių bankas customers.
+  - The negativity comes from reputational risk: banks seen as vectors or vulnerable points for fraud.
+- **Šiaulių bankas stock market performance**
+  - Coverage of declining stock value, analyst downgrades, and continued sell-offs.
+  - Tone is negative because of weak market confidence and forecasts of reduced share price.
+- **Artea liquidity/transaction issues**
+  - At least one case of a business unable to retrieve funds for an extended period.
+  - Directly undermines trust in the bank’s operations.
+
+**In short:** Artea is criticized for poor customer service (fees, delays) and linked to fraud risk. Šiaulių bankas is framed negatively in financial press due to declining share value and negative analyst outlooks.
+"""
 
 def render(mode: str = "by_company"):
     """
@@ -31,68 +54,57 @@ def render(mode: str = "by_company"):
 
     start_date, end_date = get_selected_date_range()
     
-    # Filter data by date range
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    # Filter data by date range, keeping only the columns this section uses
+    df_filtered = slice_date_range(df, start_date, end_date)[['company', 'Sentiment']].copy()
     
     # Get selected brands from session state and filter
     selected_brands = st.session_state.get("selected_brands", [])
     
     if selected_brands:
         # Normalize the company names in the data and filter
-        df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
+        df_filtered['normalized_company'] = normalize_brand_series(df_filtered['company'], "pr")
         df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
 
+    if df_filtered.empty:
+        st.warning("No sentiment data available.")
+        return
+
     if mode == "by_company":
-        sentiment_summary = {}
-        all_dfs = []
-
-        # Get unique companies from the filtered data
-        companies = df_filtered['company'].unique()
-        
-        for company in companies:
-            company_df = df_filtered[df_filtered['company'] == company]
-            if company_df.empty or "Sentiment" not in company_df.columns:
-                continue
-
-            if company_df.empty:
-                continue
-
-            # Get normalized company name for display
-            normalized_company = normalize_brand_name(company, "pr")
-
-            all_dfs.append(company_df)
-            sentiment_counts = company_df["Sentiment"].value_counts(normalize=True) * 100
-            sentiment_summary[f"{normalized_company} ({len(company_df)})"] = {
-                "Positive": sentiment_counts.get("Positive", 0),
-                "Neutral": sentiment_counts.get("Neutral", 0),
-                "Negative": sentiment_counts.get("Negative", 0)
-            }
-
-        if not sentiment_summary:
+        sentiment_levels = ["Positive", "Neutral", "Negative"]
+
+        # Rows per company (in order of appearance) and sentiment counts in one groupby
+        company_sizes = df_filtered.groupby('company', sort=False, observed=True).size()
+        counts = (
+            df_filtered.groupby(['company', 'Sentiment'], sort=False, observed=True).size()
+            .unstack('Sentiment', fill_value=0)
+            .reindex(index=company_sizes.index, fill_value=0)
+        )
+        counts.columns = counts.columns.astype(str)
+
+        if counts.empty:
             st.warning("No sentiment data available.")
             return
 
-        # Add combined bar
-        if all_dfs:
-            df_all = pd.concat(all_dfs, ignore_index=True)
-            sentiment_counts = df_all["Sentiment"].value_counts(normalize=True) * 100
-            sentiment_summary[f"All Brands ({len(df_all)})"] = {
-                "Positive": sentiment_counts.get("Positive", 0),
-                "Neutral": sentiment_counts.get("Neutral", 0),
-                "Negative": sentiment_counts.get("Negative", 0)
-            }
+        # Row-normalize over all sentiment values, then keep the three plotted ones
+        pct = (counts.div(counts.sum(axis=1), axis=0) * 100).fillna(0)
+        pct = pct.reindex(columns=sentiment_levels, fill_value=0)
+
+        pct.index = [f"{normalize_brand_name(company, 'pr')} ({n})" for company, n in company_sizes.items()]
 
-        df_sent = pd.DataFrame.from_dict(sentiment_summary, orient="index").reset_index()
-        df_sent = df_sent.melt(id_vars=["index"], var_name="Sentiment", value_name="Percentage")
-        df_sent.columns = ["Company", "Sentiment", "Percentage"]
+        # Add combined bar from the column sums of the same table
+        total_counts = counts.sum()
+        all_pct = (total_counts / total_counts.sum() * 100).reindex(sentiment_levels, fill_value=0).fillna(0)
+        pct.loc[f"All Brands ({company_sizes.sum()})"] = all_pct
+
+        # Straight to long form for plotting
+        df_sent = (
+            pct.rename_axis(index="Company", columns=None).reset_index()
+            .melt(id_vars="Company", var_name="Sentiment", value_name="Percentage")
+        )
 
     else:  # mode == "combined"
         # Use the same filtered data that was already loaded
-        if df_filtered.empty:
-            st.warning("No sentiment data available.")
-            return
-
-        sentiment_counts = df_filtered["Sentiment"].value_counts(normalize=True) * 100
+        sentiment_counts = df_filtered["Sentiment"].value_counts(normalize=True, sort=False) * 100
 
         df_sent = pd.DataFrame({
             "Company": ["All Brands"] * 3,
@@ -125,27 +137,6 @@ def render(mode: str = "by_company"):
     st.plotly_chart(fig, use_container_width=True)
 
     # --- Added: Negative sentiment article topics for Artea (no article numbers) ---
-    if "Artea" in BRANDS:
+    if _SHOW_ARTEA_TOPICS:
         with st.expander("🔎 Negative sentiment article topics for Artea", expanded=False):
-            st.markdown(
-                """
-- **Client frustrations with Artea (multiple cases)**
-  - Unexpected bank fees on account balances.
-  - Complaints spreading on social media about poor treatment of customers.
-  - These are reputational hits tied to service quality and fee transparency.
-- **Broader financial/economic pressure**
-  - Tax changes and economic downturn discussions reflect negatively on banks, with Artea mentioned as an example.
-  - Suggests an association with systemic financial stress, not necessarily misconduct by the bank itself.
-- **Fraud and scams targeting customers**
-  - Several stories about scams and fraud attempts, where criminals impersonated or exploited Artea/Šiaulių bankas customers.
-  - The negativity comes from reputational risk: banks seen as vectors or vulnerable points for fraud.
-- **Šiaulių bankas stock market performance**
-  - Coverage of declining stock value, analyst downgrades, and continued sell-offs.
-  - Tone is negative because of weak market confidence and forecasts of reduced share price.
-- **Artea liquidity/transaction issues**
-  - At least one case of a business unable to retrieve funds for an extended period.
-  - Directly undermines trust in the bank’s operations.
-
-**In short:** Artea is criticized for poor customer service (fees, delays) and linked to fraud risk. Šiaulių bankas is framed negatively in financial press due to declining share value and negative analyst outlooks.
-                """
-            )
+            st.markdown(_ARTEA_NEGATIVE_MD)
@@ -6,13 +6,14 @@ Shows top 3 metrics: Engagement, Brand Strength, Creativity
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 import glob
-from utils.file_io import load_monthly_social_media_data, get_selected_date_range, load_creativity_analysis, load_compos_analysis
-from utils.config import normalize_brand_name, get_brand_column
+from utils.file_io import load_selected_social_media_data, get_selected_date_range, load_creativity_analysis, load_compos_analysis, get_monthly_data_mtime
+from utils.config import normalize_brand_name, normalize_brand_series
 
 def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=None):
-    """Format a metric card with optional percentage change and ranking."""
+    """Format a metric card with optional percentage change and ranking, returned as HTML."""
     rank_color = "gray"
     if rank_now is not None and total_ranks:
         if int(rank_now) == 1:
@@ -27,31 +28,38 @@ def _format_simple_metric_card(label, val, pct=None, rank_now=None, total_ranks=
     pct_html = f'<p style="margin:0; color:{pct_color};">Δ {pct:.1f}%</p>' if pct is not None else ''
     rank_html = f'<p style="margin:0; color:{rank_color};">Rank {int(rank_now)}</p>' if rank_now is not None else ''
     
-    st.markdown(
-        f"""
-        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-            <h5 style="margin:0;">{label}</h5>
-            <h3 style="margin:5px 0;">{val}</h3>
-            {pct_html}
-            {rank_html}
-        </div>
-        """,
-        unsafe_allow_html=True,
+    return (
+        '<div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">'
+        f'<h5 style="margin:0;">{label}</h5>'
+        f'<h3 style="margin:5px 0;">{val}</h3>'
+        f'{pct_html}'
+        f'{rank_html}'
+        '</div>'
     )
 
-def _load_creativity_data():
-    """Load creativity analysis data for social media - ONLY from selected month, no fallbacks."""
+def _min_ranks(values):
+    """Descending rank of each value in a small {brand: value} dict, ties sharing the best rank (rank method="min")."""
+    vals = np.fromiter(values.values(), dtype="float64", count=len(values))
+    ranks = (vals[None, :] > vals[:, None]).sum(axis=1) + 1
+    return dict(zip(values.keys(), ranks.tolist()))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_creativity_data(start_date, end_date, mtime):
+    """Load creativity analysis data for social media - ONLY from selected month, no fallbacks.
+    
+    The arguments only key the cache; the loader reads the selected range itself.
+    """
     try:
         creativity_data = load_creativity_analysis("social_media")
         if not creativity_data.empty:
             # Handle different column names between old and new formats
             if 'brand' in creativity_data.columns:
                 # New format (September 2025+)
-                creativity_data['normalized_brand'] = creativity_data['brand'].apply(lambda x: normalize_brand_name(x, "social_media"))
+                creativity_data['normalized_brand'] = normalize_brand_series(creativity_data['brand'], "social_media")
             elif 'Company' in creativity_data.columns:
                 # Old format (August 2025 and earlier)
                 creativity_data['brand'] = creativity_data['Company']  # Standardize to 'brand'
-                creativity_data['normalized_brand'] = creativity_data['brand'].apply(lambda x: normalize_brand_name(x, "social_media"))
+                creativity_data['normalized_brand'] = normalize_brand_series(creativity_data['brand'], "social_media")
             else:
                 # No brand column found
                 return pd.DataFrame()
@@ -61,24 +69,27 @@ def _load_creativity_data():
         print(f"Error in _load_creativity_data: {e}")  # Debug print
         return pd.DataFrame()
 
-def _load_brand_strength_data():
-    """Load brand strength from compos analysis for social media - ONLY from selected month, no fallbacks."""
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_brand_strength_data(start_date, end_date, mtime):
+    """Load brand strength from compos analysis for social media - ONLY from selected month, no fallbacks.
+    
+    The arguments only key the cache; the loader reads the selected range itself.
+    """
     try:
         compos_data = load_compos_analysis("social_media")
         if not compos_data.empty:
-            # Calculate brand strength as percentage of dominant archetype
-            strength_data = {}
             # Use 'Company' (capital C) instead of 'brand'
             company_col = 'Company' if 'Company' in compos_data.columns else 'brand'
-            for brand in compos_data.get(company_col, []):
-                brand_data = compos_data[compos_data[company_col] == brand]
-                if 'Top Archetype' in brand_data.columns and len(brand_data.dropna(subset=['Top Archetype'])) > 0:
-                    vc = brand_data['Top Archetype'].dropna().value_counts()
-                    pct = float((vc.max() / vc.sum()) * 100) if vc.sum() > 0 else 0.0
-                    # Normalize the brand name to match engagement data
-                    normalized_brand = normalize_brand_name(brand, "social_media")
-                    strength_data[normalized_brand] = pct
-            return strength_data
+            if company_col not in compos_data.columns or 'Top Archetype' not in compos_data.columns:
+                return {}
+            
+            # Brand strength = percentage of the dominant archetype, from one brand x archetype table
+            ct = pd.crosstab(compos_data[company_col], compos_data['Top Archetype'])
+            totals = ct.sum(axis=1)
+            pct = (ct.max(axis=1) / totals.replace(0, np.nan) * 100).fillna(0.0)
+            
+            # Normalize the brand names to match engagement data
+            return {normalize_brand_name(brand, "social_media"): float(value) for brand, value in pct[totals > 0].items()}
         return {}
     except Exception as e:
         print(f"Error in _load_brand_strength_data: {e}")  # Debug print
@@ -88,46 +99,12 @@ def _compute_social_engagement_totals():
     """Compute total engagement for each brand from social media data."""
     engagement_totals = {}
     
-    # Load social media data
-    df = load_monthly_social_media_data()
-    if df is None or df.empty:
-        return engagement_totals
-    
-    # Filter by date range
-    start_date, end_date = get_selected_date_range()
-    if df['date'].dt.tz is not None:
-        start_date = pd.Timestamp(start_date).tz_localize('UTC')
-        end_date = pd.Timestamp(end_date).tz_localize('UTC')
-    
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Always normalize company names for display
-    brand_col = get_brand_column("social_media")
-    df_filtered['normalized_company'] = df_filtered[brand_col].apply(lambda x: normalize_brand_name(x, "social_media"))
-    
-    # Get selected brands from session state and filter
-    selected_brands = st.session_state.get("selected_brands", [])
+    # Load social media data for the selected month and brands
+    df_filtered = load_selected_social_media_data()
     
-    if selected_brands:
-        df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
-    
-    if not df_filtered.empty:
-        # Calculate engagement using the same logic as data loading
-        if "likes" in df_filtered.columns and "num_comments" in df_filtered.columns and "num_shares" in df_filtered.columns:
-            # Calculate total engagement: likes + comments*3 + shares*5
-            likes = pd.to_numeric(df_filtered["likes"], errors="coerce").fillna(0)
-            comments = pd.to_numeric(df_filtered["num_comments"], errors="coerce").fillna(0)
-            shares = pd.to_numeric(df_filtered["num_shares"], errors="coerce").fillna(0)
-            df_filtered["calculated_engagement"] = likes + comments * 3 + shares * 5
-        elif "total_engagement" in df_filtered.columns:
-            df_filtered["calculated_engagement"] = pd.to_numeric(df_filtered["total_engagement"], errors="coerce").fillna(0)
-        else:
-            df_filtered["calculated_engagement"] = 0
-        
-        # Group by normalized company and sum engagement
-        engagement_by_brand = df_filtered.groupby('normalized_company')['calculated_engagement'].sum()
-        engagement_totals = engagement_by_brand.to_dict()
-        
+    if df_filtered is not None and not df_filtered.empty:
+        # Group by normalized company and sum the engagement computed at load time
+        engagement_totals = df_filtered.groupby('normalized_company')['calculated_engagement'].sum().to_dict()
     
     return engagement_totals
 
@@ -136,9 +113,11 @@ def render():
     st.markdown("### 📊 Social Media Performance Metrics")
     
     # Load data
+    start_date, end_date = get_selected_date_range()
+    mtime = get_monthly_data_mtime("social_media")
     engagement_totals = _compute_social_engagement_totals()
-    strength_data = _load_brand_strength_data()
-    creativity_data = _load_creativity_data()
+    strength_data = _load_brand_strength_data(start_date, end_date, mtime)
+    creativity_data = _load_creativity_data(start_date, end_date, mtime)
     
     # Get selected brands from session state (the "subset of companies")
     selected_brands = st.session_state.get("selected_brands", [])
@@ -157,89 +136,90 @@ def render():
         return
     
     # Calculate rankings and means
-    engagement_series = pd.Series(engagement_totals)
-    engagement_mean = engagement_series.mean() if len(engagement_series) else 0
-    engagement_ranks = engagement_series.rank(ascending=False, method="min") if len(engagement_series) else pd.Series(dtype=float)
+    engagement_mean = np.mean(list(engagement_totals.values())) if engagement_totals else 0
+    engagement_ranks = _min_ranks(engagement_totals)
     
-    strength_series = pd.Series(strength_data)
-    strength_mean = strength_series.mean() if len(strength_series) else 0
-    strength_ranks = strength_series.rank(ascending=False, method="min") if len(strength_series) else pd.Series(dtype=float)
+    strength_mean = np.mean(list(strength_data.values())) if strength_data else 0
+    strength_ranks = _min_ranks(strength_data)
+    
+    # Creativity mean and a per-brand index, shared by every tab (first row per brand wins)
+    if not creativity_data.empty and 'normalized_brand' in creativity_data.columns:
+        creativity_scores = creativity_data['originality_score'].dropna()
+        creativity_mean = creativity_scores.mean() if len(creativity_scores) > 0 else 0
+        cre_by_brand = creativity_data.drop_duplicates('normalized_brand').set_index('normalized_brand')
+    else:
+        creativity_mean = 0
+        cre_by_brand = pd.DataFrame()
     
     # Create brand tabs
     brand_tabs = st.tabs(available_brands)
     for i, brand_name in enumerate(available_brands):
         with brand_tabs[i]:
-            col1, col2, col3 = st.columns(3)
+            # Creativity row for this brand, shared by the metric card and the analysis block
+            brand_creativity = cre_by_brand.loc[brand_name] if brand_name in cre_by_brand.index else None
+            if brand_creativity is not None:
+                score = brand_creativity.get('originality_score', 0)
+                rank_cre = brand_creativity.get('rank', None)
             
             # Social Media Engagement
-            with col1:
-                total_engagement = int(engagement_totals.get(brand_name, 0))
-                delta_mean_pct = ((total_engagement - (engagement_mean if engagement_mean != 0 else 1)) / (engagement_mean if engagement_mean != 0 else 1)) * 100 if engagement_mean != 0 else 0
-                rank_now = engagement_ranks.get(brand_name, None) if len(engagement_ranks) else None
-                _format_simple_metric_card(
-                    label="Engagement",
-                    val=f"{total_engagement:,}",
-                    pct=delta_mean_pct,
-                    rank_now=rank_now,
-                    total_ranks=len(engagement_ranks) if len(engagement_ranks) else None
-                )
+            total_engagement = int(engagement_totals.get(brand_name, 0))
+            delta_mean_pct = ((total_engagement - (engagement_mean if engagement_mean != 0 else 1)) / (engagement_mean if engagement_mean != 0 else 1)) * 100 if engagement_mean != 0 else 0
+            rank_now = engagement_ranks.get(brand_name, None) if len(engagement_ranks) else None
+            engagement_card = _format_simple_metric_card(
+                label="Engagement",
+                val=f"{total_engagement:,}",
+                pct=delta_mean_pct,
+                rank_now=rank_now,
+                total_ranks=len(engagement_ranks) if len(engagement_ranks) else None
+            )
             
             # Brand Strength
-            with col2:
-                if brand_name in strength_data:
-                    strength = float(strength_data[brand_name])
-                    rank_bs = int(strength_ranks.get(brand_name, 0))
-                    delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
-                    _format_simple_metric_card(
-                        label="Brand Strength",
-                        val=f"{strength:.1f}%",
-                        pct=delta_bs,
-                        rank_now=rank_bs,
-                        total_ranks=len(strength_ranks)
-                    )
-                else:
-                    _format_simple_metric_card("Brand Strength", "N/A")
+            if brand_name in strength_data:
+                strength = float(strength_data[brand_name])
+                rank_bs = int(strength_ranks.get(brand_name, 0))
+                delta_bs = ((strength - (strength_mean if strength_mean != 0 else 1)) / (strength_mean if strength_mean != 0 else 1)) * 100 if strength_mean != 0 else 0
+                strength_card = _format_simple_metric_card(
+                    label="Brand Strength",
+                    val=f"{strength:.1f}%",
+                    pct=delta_bs,
+                    rank_now=rank_bs,
+                    total_ranks=len(strength_ranks)
+                )
+            else:
+                strength_card = _format_simple_metric_card("Brand Strength", "N/A")
             
             # Creativity
-            with col3:
-                if not creativity_data.empty and 'normalized_brand' in creativity_data.columns:
-                    brand_creativity = creativity_data[creativity_data['normalized_brand'] == brand_name]
-                    if not brand_creativity.empty:
-                        score = brand_creativity.iloc[0].get('originality_score', 0)
-                        rank_cre = brand_creativity.iloc[0].get('rank', None)
-                        
-                        # Calculate delta vs mean since it's not provided in the data
-                        creativity_scores = creativity_data['originality_score'].dropna()
-                        creativity_mean = creativity_scores.mean() if len(creativity_scores) > 0 else 0
-                        delta_cre = ((score - creativity_mean) / (creativity_mean if creativity_mean != 0 else 1)) * 100 if creativity_mean != 0 else 0
-                        
-                        _format_simple_metric_card(
-                            label="Creativity",
-                            val=f"{score:.2f}",
-                            pct=delta_cre,
-                            rank_now=rank_cre,
-                            total_ranks=len(creativity_data)
-                        )
-                    else:
-                        _format_simple_metric_card("Creativity", "N/A")
-                else:
-                    _format_simple_metric_card("Creativity", "N/A")
+            if brand_creativity is not None:
+                # Calculate delta vs mean since it's not provided in the data
+                delta_cre = ((score - creativity_mean) / (creativity_mean if creativity_mean != 0 else 1)) * 100 if creativity_mean != 0 else 0
+                
+                creativity_card = _format_simple_metric_card(
+                    label="Creativity",
+                    val=f"{score:.2f}",
+                    pct=delta_cre,
+                    rank_now=rank_cre,
+                    total_ranks=len(creativity_data)
+                )
+            else:
+                creativity_card = _format_simple_metric_card("Creativity", "N/A")
+            
+            # All three cards in one equal-width row
+            cards_html = "".join(f'<div style="flex:1; min-width:0;">{card}</div>' for card in (engagement_card, strength_card, creativity_card))
+            st.markdown(f'<div style="display:flex; gap:16px;">{cards_html}</div>', unsafe_allow_html=True)
             
             # Creativity Analysis section (full width, outside columns)
-            if not creativity_data.empty and 'normalized_brand' in creativity_data.columns:
-                brand_creativity = creativity_data[creativity_data['normalized_brand'] == brand_name]
-                if not brand_creativity.empty:
-                    score = brand_creativity.iloc[0].get('originality_score', 0)
-                    rank_cre = brand_creativity.iloc[0].get('rank', None)
-                    just_text = str(brand_creativity.iloc[0].get('justification', '')) if pd.notna(brand_creativity.iloc[0].get('justification', '')) else ""
-                    examples_text = str(brand_creativity.iloc[0].get('examples', '')) if pd.notna(brand_creativity.iloc[0].get('examples', '')) else ""
-                    
-                    if just_text or examples_text:
-                        st.markdown("#### Creativity Analysis")
-                        st.markdown(f"""
-                        <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
-                            <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
-                            {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
-                            {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
-                        </div>
-                        """, unsafe_allow_html=True)
+            if brand_creativity is not None:
+                just_text = brand_creativity.get('justification', '')
+                just_text = str(just_text) if pd.notna(just_text) else ""
+                examples_text = brand_creativity.get('examples', '')
+                examples_text = str(examples_text) if pd.notna(examples_text) else ""
+                
+                if just_text or examples_text:
+                    st.markdown("#### Creativity Analysis")
+                    st.markdown(f"""
+                    <div style="border:1px solid #ddd; border-radius:10px; padding:15px; margin-bottom:10px;">
+                        <h5 style="margin:0;">{brand_name} — {f'Rank {rank_cre} — ' if rank_cre is not None else ''}Score {score:.2f}</h5>
+                        {f'<p style="margin:8px 0 0; color:#444;">{just_text}</p>' if just_text else ''}
+                        {f'<p style="margin:8px 0 0; color:#444;">Examples: {examples_text}</p>' if examples_text else ''}
+                    </div>
+                    """, unsafe_allow_html=True)
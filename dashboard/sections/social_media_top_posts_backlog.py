@@ -80,9 +80,12 @@ def render(selected_platforms=None):
             st.markdown("**Top 5 posts overall**")
             st.markdown(df_all.head(5).to_markdown(index=False), unsafe_allow_html=True)
 
+        # Partition the posts by company once instead of masking df_all per tab
+        posts_by_company = dict(tuple(df_all.groupby("Company", sort=False)))
+
         for i, brand_display in enumerate(brand_display_names, start=1):
             with tabs[i]:
-                brand_df = df_all[df_all["Company"] == brand_display]
+                brand_df = posts_by_company.get(brand_display, df_all.iloc[0:0])
                 if brand_df.empty:
                     st.info(f"No posts for {brand_display}.")
                 else:
@@ -2,8 +2,21 @@ import streamlit as st
 import pandas as pd
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from config import get_keys_file_path
-from src.utils.utils import extract_date, filter_data_by_date_range
+from src.utils.utils import filter_data_by_date_range
+from utils.file_io import read_excel_via_parquet
+
+# First YYYY-MM-DD date in a snippet, for files without a "Date" column
+DATE_RE = r"(\d{4}-\d{2}-\d{2})"
+
+_TOPIC_ROW_TEMPLATE = (
+    '<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; padding: 5px; border-radius: 5px; margin-bottom: 5px;">'
+    '<div style="background-color: white; padding: 5px; border-radius: 5px; flex: 1;">{topic}</div>'
+    '<div style="background-color: lightgray; padding: 5px; border-radius: 5px; margin-left: 10px;">{pct}%</div>'
+    '</div>'
+)
 
 def create_topic_analysis(start_date, end_date):
     """
@@ -27,46 +40,38 @@ def create_topic_analysis(start_date, end_date):
     with open(keys_file, "r") as f:
         keys_data = json.load(f)
 
-    # Initialize a dictionary to store topic counts for all companies
-    topic_counts = {
-        "Cluster_Topic1": {},
-        "Cluster_Topic2": {},
-        "Cluster_Topic3": {}
-    }
+    topic_columns = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
 
-    # Loop through each company and extract topic counts
-    for company, filename in keys_data.items():
+    def _load_one(filename):
+        """Date-filtered topic columns of one company file, or None if it is missing or lacks them"""
         file_path = os.path.join("data", "data august", filename)
-
-        if os.path.exists(file_path):
-            df = pd.read_excel(file_path, sheet_name="Raw Data")
-
-            # Check if "Date" column exists, if not, create it
-            if "Date" not in df.columns:
-                df["Date"] = df["Snippet"].apply(lambda x: extract_date(x) if isinstance(x, str) else None)
-            
-            # Filter by date range
-            df_filtered = filter_data_by_date_range(df, "Date", start_date, end_date)
-
-            # Ensure the necessary topic columns exist
-            if "Cluster_Topic1" in df_filtered.columns and "Cluster_Topic2" in df_filtered.columns and "Cluster_Topic3" in df_filtered.columns:
-                # Process topics (Cluster_Topic1, Cluster_Topic2, Cluster_Topic3)
-                for column in ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]:
-                    for topic in df_filtered[column].dropna():  # Drop NaN values
-                        if topic in topic_counts[column]:
-                            topic_counts[column][topic] += 1
-                        else:
-                            topic_counts[column][topic] = 1
-
-    # Flatten the topic counts into a single list (combine counts from all columns)
-    all_topic_counts = {}
-
-    for column in topic_counts:
-        for topic, count in topic_counts[column].items():
-            if topic in all_topic_counts:
-                all_topic_counts[topic] += count
-            else:
-                all_topic_counts[topic] = count
+        if not os.path.exists(file_path):
+            return None
+
+        df = read_excel_via_parquet(file_path, sheet_name="Raw Data")
+
+        # Check if "Date" column exists, if not, create it
+        if "Date" not in df.columns:
+            df["Date"] = pd.to_datetime(df["Snippet"].astype("string").str.extract(DATE_RE, expand=False), errors="coerce")
+        
+        # Filter by date range
+        df_filtered = filter_data_by_date_range(df, "Date", start_date, end_date)
+
+        # Ensure the necessary topic columns exist
+        if not all(column in df_filtered.columns for column in topic_columns):
+            return None
+        return df_filtered[topic_columns]
+
+    # Read the company files concurrently, then count topics over all of them at once
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(keys_data))), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        frames = [frame for frame in executor.map(_load_one, keys_data.values()) if frame is not None]
+
+    if frames:
+        all_topic_counts = pd.concat(frames, ignore_index=True).melt()["value"].dropna().value_counts(sort=False)
+    else:
+        all_topic_counts = pd.Series(dtype="int64")
+    all_topic_counts = all_topic_counts.to_dict()
 
     # Get the top 5 topics based on total count across all companies
     sorted_topics = sorted(all_topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -82,15 +87,14 @@ def create_topic_analysis(start_date, end_date):
     # Create a DataFrame for the top 5 topics
     key_topics_df = pd.DataFrame(topics_data)
 
-    # Display the key topics box design
-    for _, row in key_topics_df.iterrows():
-        st.markdown(
-            f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; padding: 5px; border-radius: 5px; margin-bottom: 5px;">'
-            f'<div style="background-color: white; padding: 5px; border-radius: 5px; flex: 1;">{row["Topic Cluster"]}</div>'
-            f'<div style="background-color: lightgray; padding: 5px; border-radius: 5px; margin-left: 10px;">{row["Percentage"]}%</div>'
-            f'</div>',
-            unsafe_allow_html=True
-        )
+    # Display the key topics box design in one markdown call
+    st.markdown(
+        "".join(
+            _TOPIC_ROW_TEMPLATE.format(topic=topic, pct=pct)
+            for topic, pct in zip(key_topics_df.get("Topic Cluster", []), key_topics_df.get("Percentage", []))
+        ),
+        unsafe_allow_html=True
+    )
 
     st.markdown("<br>", unsafe_allow_html=True)  # Adds one line of vertical space
     st.markdown("<br>", unsafe_allow_html=True)  # Adds one line of vertical space
@@ -1,11 +1,21 @@
 import streamlit as st
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from utils.file_io import load_agility_data
 from utils.date_utils import get_selected_date_range
 from utils.config import BRANDS
 
 TOPIC_COLUMNS = ["Cluster_Topic1", "Cluster_Topic2", "Cluster_Topic3"]
 
+_TOPIC_ROW_TEMPLATE = (
+    '<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; '
+    'padding: 6px 10px; border-radius: 6px; margin-bottom: 6px;">'
+    '<div>{topic}</div>'
+    '<div style="background-color: #eee; padding: 4px 8px; border-radius: 4px;">{pct:.1f}%</div>'
+    '</div>'
+)
+
 def render() -> None:
     """
     Render a display of top 5 content topics from Agility data.
@@ -17,8 +27,12 @@ def render() -> None:
     company_data = {}
     brand_counts = {}
 
-    for brand in BRANDS:
-        df = load_agility_data(brand)
+    # Read the brands' Agility workbooks concurrently; the parsing is independent per file
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=min(8, len(BRANDS)), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+        loaded = list(executor.map(load_agility_data, BRANDS))
+
+    for brand, df in zip(BRANDS, loaded):
         if df is None or "Published Date" not in df.columns:
             continue
 
@@ -65,14 +79,16 @@ def extract_topics(dataframes_dict: dict) -> dict:
     """
     Extract and count topic mentions from cluster columns.
     """
-    topic_counts = {}
-    for df in dataframes_dict.values():
-        for col in TOPIC_COLUMNS:
-            for topic in df[col].dropna():
-                topic = str(topic).strip()
-                if topic:
-                    topic_counts[topic] = topic_counts.get(topic, 0) + 1
-    return topic_counts
+    if not dataframes_dict:
+        return {}
+    topics = (
+        pd.concat([df[TOPIC_COLUMNS] for df in dataframes_dict.values()], ignore_index=True)
+        .melt(value_name="Topic")["Topic"]
+        .dropna()
+        .astype(str)
+        .str.strip()
+    )
+    return topics[topics != ""].value_counts().to_dict()
 
 def display_top_topics(topic_counts: dict) -> None:
     """
@@ -85,13 +101,10 @@ def display_top_topics(topic_counts: dict) -> None:
     total = sum(topic_counts.values())
     top_5 = sorted(topic_counts.items(), key=lambda x: x[1], reverse=True)[:5]
 
-    for topic, count in top_5:
-        pct = (count / total) * 100 if total > 0 else 0
-        st.markdown(
-            f'<div style="display: flex; justify-content: space-between; border: 1px solid #ccc; '
-            f'padding: 6px 10px; border-radius: 6px; margin-bottom: 6px;">'
-            f'<div>{topic}</div>'
-            f'<div style="background-color: #eee; padding: 4px 8px; border-radius: 4px;">{pct:.1f}%</div>'
-            f'</div>',
-            unsafe_allow_html=True
-        )
+    st.markdown(
+        "".join(
+            _TOPIC_ROW_TEMPLATE.format(topic=topic, pct=(count / total) * 100 if total > 0 else 0)
+            for topic, count in top_5
+        ),
+        unsafe_allow_html=True
+    )
@@ -1,9 +1,8 @@
+from functools import lru_cache
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from utils.config import BRAND_COLORS, normalize_brand_name, get_brand_column
-from utils.file_io import load_monthly_social_media_data
-from utils.date_utils import get_selected_date_range
+from utils.config import BRAND_COLORS, get_brand_column
+from utils.file_io import load_selected_social_media_data, get_selected_date_range, get_monthly_data_mtime
 
 PLATFORMS = ["facebook"]  # Only Facebook available
 
@@ -12,7 +11,8 @@ _ALL_BRANDS = "All Brands"
 _FALLBACK = "#BDBDBD"
 _CATEGORY_ORDER = list(BRAND_COLORS.keys())
 
-def _present_color_map(present_labels) -> dict:
+@lru_cache(maxsize=32)
+def _present_color_map(present_labels: tuple) -> dict:
     m = dict(BRAND_COLORS)
     for b in present_labels:
         if b not in m:
@@ -21,6 +21,38 @@ def _present_color_map(present_labels) -> dict:
 
 # -----------------------------------------------------------------------
 
+@st.cache_data(show_spinner=False)
+def _compute_daily_trends(start_date, end_date, selected_brands: tuple, mtime: tuple):
+    """Daily post volume and engagement per brand; cached on selection, date range and data mtime."""
+    # Load social media data for the selected month and brands
+    df_filtered = load_selected_social_media_data()
+
+    if df_filtered is None:
+        return {"status": "no_data"}
+
+    if df_filtered.empty:
+        return {"status": "empty"}
+
+    if not df_filtered["date"].notna().any():
+        return {"status": "no_dates"}
+
+    # Daily post volume and engagement per brand in one groupby (engagement is computed at load time)
+    brand_col = get_brand_column("social_media")
+    has_engagement = {"likes", "num_comments", "num_shares"} <= set(df_filtered.columns) or "total_engagement" in df_filtered.columns
+    daily = (
+        df_filtered[df_filtered[brand_col].notna()]
+        .assign(Day=lambda d: d["date"].dt.normalize())
+        .groupby(["normalized_company", "Day"])
+        .agg(Volume=("date", "size"), Engagement=("calculated_engagement", "sum"))
+        .reset_index()
+        .rename(columns={"normalized_company": "Company"})
+    )
+    return {
+        "status": "ok",
+        "volume": daily[["Day", "Company", "Volume"]],
+        "engagement": daily[["Day", "Company", "Engagement"]] if has_engagement else daily.iloc[0:0],
+    }
+
 def render(selected_platforms=None):
     st.subheader("📈 Social Media Volume & Engagement Trends")
 
@@ -28,106 +60,41 @@ def render(selected_platforms=None):
     if not selected_platforms:
         selected_platforms = PLATFORMS
 
-    # Load social media data
-    df = load_monthly_social_media_data()
-    
-    if df is None or df.empty:
+    start_date, end_date = get_selected_date_range()
+    selected_brands = tuple(st.session_state.get("selected_brands", []))
+    payload = _compute_daily_trends(start_date, end_date, selected_brands, get_monthly_data_mtime("social_media"))
+
+    if payload["status"] == "no_data":
         st.info("No social media data found.")
         return
-    
-    # Check if we have the required columns
-    if "date" not in df.columns:
-        st.error("No 'date' column found in social media data")
-        return
 
-    # Filter by date range - use the selected month
-    start_date, end_date = get_selected_date_range()
-    
-    # Convert timezone-naive dates to UTC to match the data
-    if df['date'].dt.tz is not None:
-        start_date = pd.Timestamp(start_date).tz_localize('UTC')
-        end_date = pd.Timestamp(end_date).tz_localize('UTC')
-    
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    
-    # Always normalize company names for display
-    brand_col = get_brand_column("social_media")
-    df_filtered['normalized_company'] = df_filtered[brand_col].apply(lambda x: normalize_brand_name(x, "social_media"))
-    
-    # Get selected brands from session state and filter
-    selected_brands = st.session_state.get("selected_brands", [])
-    
-    if selected_brands:
-        df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
-    
-    if df_filtered.empty:
+    if payload["status"] == "empty":
         st.warning("No data available for the selected period.")
         return
 
-    # Get date range from the filtered data
-    all_dates = pd.to_datetime(df_filtered["date"], errors="coerce").dropna().tolist()
-    
-    if not all_dates:
+    # Make sure the filtered data has at least one valid date
+    if payload["status"] == "no_dates":
         st.warning("No valid dates found in social media data.")
         return
 
-    # Initialize data structures
-    volume_data, engagement_data = [], []
-
-    # Get unique companies from the filtered data
-    brand_col = get_brand_column("social_media")
-    companies = df_filtered[brand_col].unique()
-    
-    for company in companies:
-        company_df = df_filtered[df_filtered[brand_col] == company]
-        
-        if company_df.empty:
-            continue
-
-        # Get normalized company name for display
-        normalized_company = normalize_brand_name(company, "social_media")
-
-        # Group by day - ensure timezone-naive
-        company_df["Day"] = company_df["date"].dt.date
-
-        # Volume (post count) - group by day
-        daily_counts = company_df.groupby("Day").size()
-
-        # Engagement - use the same logic as data loading
-        if "likes" in company_df.columns and "num_comments" in company_df.columns and "num_shares" in company_df.columns:
-            # Calculate total engagement: likes + comments*3 + shares*5
-            likes = pd.to_numeric(company_df["likes"], errors="coerce").fillna(0)
-            comments = pd.to_numeric(company_df["num_comments"], errors="coerce").fillna(0)
-            shares = pd.to_numeric(company_df["num_shares"], errors="coerce").fillna(0)
-            company_df["calculated_engagement"] = likes + comments * 3 + shares * 5
-            daily_engagement = company_df.groupby("Day")["calculated_engagement"].sum()
-        elif "total_engagement" in company_df.columns:
-            company_df["total_engagement"] = pd.to_numeric(company_df["total_engagement"], errors="coerce").fillna(0)
-            daily_engagement = company_df.groupby("Day")["total_engagement"].sum()
-        else:
-            daily_engagement = pd.Series(dtype=float)
-
-        for day, count in daily_counts.items():
-            volume_data.append({"Day": day, "Company": normalized_company, "Volume": count})
-        for day, engagement in daily_engagement.items():
-            engagement_data.append({"Day": day, "Company": normalized_company, "Engagement": engagement})
+    volume_df = payload["volume"]
+    engagement_df = payload["engagement"]
 
     # Create tabs for Volume and Engagement
     tab1, tab2 = st.tabs(["📊 Volume", "💬 Engagement"])
 
     # Volume Tab
     with tab1:
-        if volume_data:
-            volume_df = pd.DataFrame(volume_data)
-            # Convert Day to proper datetime for better x-axis display
-            volume_df["Day"] = pd.to_datetime(volume_df["Day"])
+        if not volume_df.empty:
             fig = px.line(
                 volume_df,
                 x="Day",
                 y="Volume",
                 color="Company",
                 title="Daily Post Volume",
-                color_discrete_map=_present_color_map(volume_df["Company"].unique())
+                color_discrete_map=_present_color_map(tuple(sorted(volume_df["Company"].unique()))),
+                category_orders={"Company": _CATEGORY_ORDER},
+                render_mode="webgl"
             )
             fig.update_layout(
                 xaxis_title="Date", 
@@ -143,17 +110,16 @@ def render(selected_platforms=None):
 
     # Engagement Tab
     with tab2:
-        if engagement_data:
-            engagement_df = pd.DataFrame(engagement_data)
-            # Convert Day to proper datetime for better x-axis display
-            engagement_df["Day"] = pd.to_datetime(engagement_df["Day"])
+        if not engagement_df.empty:
             fig = px.line(
                 engagement_df,
                 x="Day",
                 y="Engagement",
                 color="Company",
                 title="Daily Engagement",
-                color_discrete_map=_present_color_map(engagement_df["Company"].unique())
+                color_discrete_map=_present_color_map(tuple(sorted(engagement_df["Company"].unique()))),
+                category_orders={"Company": _CATEGORY_ORDER},
+                render_mode="webgl"
             )
             fig.update_layout(
                 xaxis_title="Date", 
@@ -1,9 +1,10 @@
+from functools import lru_cache
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.file_io import load_monthly_pr_data
+from utils.file_io import load_monthly_pr_data, slice_date_range, get_monthly_data_mtime
 from utils.date_utils import get_selected_date_range
-from utils.config import BRANDS, BRAND_COLORS, normalize_brand_name   # <-- long-key palette, e.g., "SEB Lietuvoje"
+from utils.config import BRANDS, BRAND_COLORS, normalize_brand_series   # <-- long-key palette, e.g., "SEB Lietuvoje"
 from pandas.tseries.offsets import MonthEnd
 
 # --- name normalization: short -> long (matches BRAND_COLORS keys) ---
@@ -20,27 +21,27 @@ _ALL_BRANDS_LABEL = "All Brands"
 _FALLBACK = "#BDBDBD"
 
 def _normalized(df: pd.DataFrame) -> pd.DataFrame:
-    """Return a copy with Company values mapped to BRAND_COLORS keys."""
+    """Return the frame with Company values mapped to BRAND_COLORS keys (categoricals map per category)."""
     if "Company" not in df.columns:
         return df
-    out = df.copy()
-    out["Company"] = out["Company"].replace(NAME_MAP)
-    return out
+    return df.assign(Company=df["Company"].map(lambda name: NAME_MAP.get(name, name)))
 
-def _present_color_map(present_labels) -> dict:
-    """Color map covering present labels + neutral for 'All Brands'."""
-    m = dict(BRAND_COLORS)
-    if _ALL_BRANDS_LABEL in present_labels:
-        m[_ALL_BRANDS_LABEL] = _FALLBACK
-    # If any unexpected names appear, give them fallback too.
-    for b in present_labels:
-        if b not in m:
-            m[b] = _FALLBACK
-    return m
+# Base palette including the neutral 'All Brands' colour, built once at import
+_BASE_COLOR_MAP = dict(BRAND_COLORS)
+_BASE_COLOR_MAP[_ALL_BRANDS_LABEL] = _FALLBACK
+
+@lru_cache(maxsize=32)
+def _present_color_map(present_labels: frozenset) -> dict:
+    """Color map covering present labels; unexpected names get the fallback colour."""
+    return {b: _BASE_COLOR_MAP.get(b, _FALLBACK) for b in present_labels}
 
 _CATEGORY_ORDER = list(BRAND_COLORS.keys()) + [_ALL_BRANDS_LABEL]
 # ---------------------------------------------------------------
 
+# --- article drill-down table ---
+ARTICLE_COLUMNS = ["Title", "Outlet", "Published Date", "Coverage Snippet", "Sentiment", "Impressions", "Link"]
+SENTIMENT_DISPLAY = {"Positive": "🟢 Positive", "Negative": "🔴 Negative"}
+
 def show_articles_for_date_company(df_filtered, selected_date, selected_company):
     """Show articles for a specific date and company"""
     # Convert selected_date to datetime if it's not already
@@ -49,10 +50,9 @@ def show_articles_for_date_company(df_filtered, selected_date, selected_company)
     elif hasattr(selected_date, 'date'):
         selected_date = selected_date.date()
     
-    # Filter data for the selected date and company
-    df_filtered['date_only'] = df_filtered['date'].dt.date
+    # Filter data for the selected date and company (compare midnight-normalized datetimes, no per-row date objects)
     articles = df_filtered[
-        (df_filtered['date_only'] == selected_date) & 
+        (df_filtered['date'].dt.normalize() == pd.Timestamp(selected_date)) & 
         (df_filtered['normalized_company'] == selected_company)
     ]
     
@@ -62,36 +62,71 @@ def show_articles_for_date_company(df_filtered, selected_date, selected_company)
     
     st.success(f"Found {len(articles)} articles for {selected_company} on {selected_date.strftime('%B %d, %Y')}")
     
-    # Display articles in a nice format
-    for idx, article in articles.iterrows():
-        with st.expander(f"📰 {article.get('Title', 'No Title')[:80]}..."):
-            col1, col2 = st.columns([2, 1])
-            
-            with col1:
-                st.markdown(f"**Title:** {article.get('Title', 'N/A')}")
-                st.markdown(f"**Outlet:** {article.get('Outlet', 'N/A')}")
-                st.markdown(f"**Published:** {article.get('Published Date', 'N/A')}")
-                
-                if pd.notna(article.get('Coverage Snippet')):
-                    st.markdown(f"**Snippet:** {article.get('Coverage Snippet', 'N/A')}")
-                
-                if pd.notna(article.get('Sentiment')):
-                    sentiment = article.get('Sentiment', 'N/A')
-                    if sentiment == 'Positive':
-                        st.markdown(f"**Sentiment:** 🟢 {sentiment}")
-                    elif sentiment == 'Negative':
-                        st.markdown(f"**Sentiment:** 🔴 {sentiment}")
-                    else:
-                        st.markdown(f"**Sentiment:** 🟡 {sentiment}")
-            
-            with col2:
-                if pd.notna(article.get('Impressions')):
-                    st.metric("Impressions", f"{article.get('Impressions', 0):,}")
-                
-                if pd.notna(article.get('Link')):
-                    st.markdown(f"[🔗 Read Article]({article.get('Link')})")
-                else:
-                    st.info("No link available")
+    # Display the articles as one table instead of an expander per article
+    columns = [col for col in ARTICLE_COLUMNS if col in articles.columns]
+    table = articles[columns]
+    if 'Sentiment' in table.columns:
+        sentiment = table['Sentiment'].astype(object)
+        table = table.assign(Sentiment=sentiment.map(SENTIMENT_DISPLAY).fillna("🟡 " + sentiment.astype(str)).where(sentiment.notna()))
+    if 'Impressions' in table.columns:
+        table = table.assign(Impressions=pd.to_numeric(table['Impressions'], errors='coerce'))
+    st.dataframe(
+        table,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Impressions": st.column_config.NumberColumn("Impressions", format="%d"),
+            "Link": st.column_config.LinkColumn("Link"),
+        }
+    )
+
+def _with_selected_brands(df_filtered: pd.DataFrame, selected_brands) -> pd.DataFrame:
+    """Add a categorical 'normalized_company' column and keep only the selected brands (all if none)."""
+    # Normalize the company names once; the brand filter and the daily rollup both use them.
+    # Stored as a category so the groupby hashes integer codes rather than strings.
+    df_filtered = df_filtered.assign(normalized_company=normalize_brand_series(df_filtered['company'], "pr").astype('category'))
+    if selected_brands:
+        df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
+    return df_filtered
+
+@st.cache_data(show_spinner=False)
+def _compute_daily_series(start_date, end_date, selected_brands: tuple, mode: str, mtime: tuple):
+    """Daily volume and impressions frames for the charts; cached on date range, brands, mode and data mtime."""
+    df_filtered = _with_selected_brands(slice_date_range(load_monthly_pr_data(), start_date, end_date), selected_brands)
+
+    # Create daily date range for the selected month
+    daily_dates = pd.date_range(start=start_date, end=end_date, freq='D')
+
+    # Daily article counts and impressions in one groupby, zero-filled over the month
+    impressions = pd.to_numeric(df_filtered["Impressions"], errors="coerce").fillna(0) if "Impressions" in df_filtered.columns else 0
+    rows = df_filtered[df_filtered['normalized_company'] != ""].assign(Impressions=impressions)
+
+    if mode == "combined":
+        # One line over all companies: group by day only instead of re-summing per-company series
+        daily = (
+            rows.groupby(pd.Grouper(key='date', freq='D'))
+            .agg(Volume=('date', 'size'), Impressions=('Impressions', 'sum'))
+            .reindex(daily_dates if not rows.empty else daily_dates[:0], fill_value=0)
+            .rename_axis('Date')
+            .reset_index()
+        )
+        daily["Company"] = _ALL_BRANDS_LABEL
+    else:
+        daily = (
+            rows.groupby(['normalized_company', pd.Grouper(key='date', freq='D')], observed=True)
+            .agg(Volume=('date', 'size'), Impressions=('Impressions', 'sum'))
+        )
+        companies = daily.index.get_level_values('normalized_company').unique()
+        daily = daily.reindex(
+            pd.MultiIndex.from_product([companies, daily_dates], names=['Company', 'Date']),
+            fill_value=0
+        ).reset_index()
+
+    # Narrow the plotted article counts to 32-bit so Plotly ships half the bytes; impression sums
+    # (all companies in combined mode) can pass the int32 range, so they are sent as float32
+    df_volume = daily[["Date", "Company", "Volume"]].astype({"Volume": "int32"})
+    df_impressions = daily[["Date", "Company", "Impressions"]].astype({"Impressions": "float32"})
+    return df_volume, df_impressions
 
 def render(mode: str = "by_company"):
     """
@@ -124,85 +159,32 @@ def render(mode: str = "by_company"):
         st.error(f"Error getting selected date range: {e}")
         return
 
-    # Filter data by selected date range
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df_filtered = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
+    # Filter data by selected date range ('date' is parsed and sorted at load time)
+    df_filtered = slice_date_range(df, start_date, end_date)
     
     if df_filtered.empty:
         st.warning(f"No data available for the selected period ({start_date.strftime('%B %Y')}).")
         return
 
     # Get selected brands from session state and filter
-    selected_brands = st.session_state.get("selected_brands", [])
-    
-    if selected_brands:
-        # Normalize the company names in the data and filter
-        df_filtered['normalized_company'] = df_filtered['company'].apply(lambda x: normalize_brand_name(x, "pr"))
-        df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
+    selected_brands = tuple(st.session_state.get("selected_brands", []))
+    df_filtered = _with_selected_brands(df_filtered, selected_brands)
 
     if df_filtered.empty:
         st.warning("No data available for the selected brands and period.")
         return
 
-    # Create daily date range for the selected month
-    daily_dates = pd.date_range(start=start_date, end=end_date, freq='D')
-
-    # Initialize data structures
-    volume_data, impressions_data = [], []
-
-    # Get unique companies from the filtered data
-    companies = df_filtered['company'].unique()
-    
-    for company in companies:
-        company_df = df_filtered[df_filtered['company'] == company]
-        
-        if company_df.empty:
-            continue
-
-        # Get normalized company name for display
-        normalized_company = normalize_brand_name(company, "pr")
-
-        # Group by day and count articles
-        company_df['date_only'] = company_df['date'].dt.date
-        daily_counts = company_df.groupby('date_only').size()
-        
-        # Create a complete daily series with zeros for missing days
-        daily_series = pd.Series(0, index=daily_dates.date)
-        daily_series.update(daily_counts)
-
-        # Impressions
-        if "Impressions" in company_df.columns:
-            company_df["Impressions"] = pd.to_numeric(company_df["Impressions"], errors="coerce").fillna(0)
-            daily_impressions = company_df.groupby('date_only')["Impressions"].sum()
-            daily_impressions_series = pd.Series(0, index=daily_dates.date)
-            daily_impressions_series.update(daily_impressions)
-        else:
-            daily_impressions_series = pd.Series(0, index=daily_dates.date)
-
-        if mode == "by_company":
-            for date, count in daily_series.items():
-                volume_data.append({"Date": date, "Company": normalized_company, "Volume": count})
-            for date, impressions in daily_impressions_series.items():
-                impressions_data.append({"Date": date, "Company": normalized_company, "Impressions": impressions})
-        else:  # combined
-            for date, count in daily_series.items():
-                volume_data.append({"Date": date, "Company": _ALL_BRANDS_LABEL, "Volume": count if company == companies[0] else 0})
-            for date, impressions in daily_impressions_series.items():
-                impressions_data.append({"Date": date, "Company": _ALL_BRANDS_LABEL, "Impressions": impressions if company == companies[0] else 0})
+    # Daily series are cached per selection, so reruns (tab switches, drill-down clicks) skip the groupby
+    df_volume, df_impressions = _compute_daily_series(start_date, end_date, selected_brands, mode, get_monthly_data_mtime("pr"))
 
     # Tabs
     tab1, tab2 = st.tabs(["📊 Volume", "👁️ Impressions"])
 
     # Volume Tab
     with tab1:
-        if not volume_data:
+        if df_volume.empty:
             st.warning("No volume data found.")
         else:
-            df_volume = pd.DataFrame(volume_data)
-            if mode == "combined":
-                df_volume = df_volume.groupby("Date", as_index=False).agg({"Volume": "sum"})
-                df_volume["Company"] = _ALL_BRANDS_LABEL
-
             df_volume = _normalized(df_volume)  # <-- normalize names
             
             # Enhanced hover information
@@ -213,9 +195,10 @@ def render(mode: str = "by_company"):
                 color="Company",
                 markers=True,
                 title=f"Daily Media Mentions - {start_date.strftime('%B %Y')}",
-                color_discrete_map=_present_color_map(df_volume["Company"].unique()),
+                color_discrete_map=_present_color_map(frozenset(df_volume["Company"].unique())),
                 category_orders={"Company": _CATEGORY_ORDER},
-                hover_data={"Date": True, "Volume": True, "Company": True}
+                hover_data={"Date": True, "Volume": True, "Company": True},
+                render_mode="webgl"
             )
             
             # Enhanced hover template
@@ -265,14 +248,9 @@ def render(mode: str = "by_company"):
 
     # Impressions Tab
     with tab2:
-        if not impressions_data:
+        if df_impressions.empty:
             st.warning("No impressions data found.")
         else:
-            df_impressions = pd.DataFrame(impressions_data)
-            if mode == "combined":
-                df_impressions = df_impressions.groupby("Date", as_index=False).agg({"Impressions": "sum"})
-                df_impressions["Company"] = _ALL_BRANDS_LABEL
-
             df_impressions = _normalized(df_impressions)  # <-- normalize names
             fig_impressions = px.line(
                 df_impressions,
@@ -281,8 +259,9 @@ def render(mode: str = "by_company"):
                 color="Company",
                 markers=True,
                 title=f"Daily Total Impressions - {start_date.strftime('%B %Y')}",
-                color_discrete_map=_present_color_map(df_impressions["Company"].unique()),
+                color_discrete_map=_present_color_map(frozenset(df_impressions["Company"].unique())),
                 category_orders={"Company": _CATEGORY_ORDER},
+                render_mode="webgl",
             )
             fig_impressions.update_layout(
                 xaxis_title="Date",
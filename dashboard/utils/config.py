@@ -1,6 +1,9 @@
 # utils/config.py
 
 import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
 
 # Top-level folder where your data is stored - updated to use dashboard_data
 # Check if we're running from dashboard directory or root directory
@@ -247,31 +250,40 @@ ADS_KEY_ADVANTAGES_BRAND_MAPPING = {
     "Rimi_Lietuva": "Rimi"
 }
 
+@lru_cache(maxsize=None)
+def _brand_mapping(media_type: str, is_creativity_data: bool, is_key_advantages_data: bool) -> dict:
+    """Merged name mapping for a media type and data flavour (key advantages > creativity > base ads)"""
+    if media_type == "social_media":
+        return SOCIAL_MEDIA_BRAND_MAPPING
+    if media_type == "pr":
+        return PR_BRAND_MAPPING
+    if media_type == "ads":
+        mapping = dict(ADS_BRAND_MAPPING)
+        if is_creativity_data:
+            mapping.update(ADS_CREATIVITY_BRAND_MAPPING)
+        if is_key_advantages_data:
+            mapping.update(ADS_KEY_ADVANTAGES_BRAND_MAPPING)
+        return mapping
+    return {}
+
+@lru_cache(maxsize=4096)
 def normalize_brand_name(brand_name: str, media_type: str, is_creativity_data: bool = False, is_key_advantages_data: bool = False) -> str:
     """Normalize brand name to standard format"""
     if not isinstance(brand_name, str):
         return ""
     
-    # Clean the brand name
+    # Clean the brand name and apply the merged mapping for this media type (fallback: cleaned name)
     cleaned = brand_name.strip()
-    
-    # Apply mapping based on media type
-    if media_type == "social_media" and cleaned in SOCIAL_MEDIA_BRAND_MAPPING:
-        return SOCIAL_MEDIA_BRAND_MAPPING[cleaned]
-    elif media_type == "pr" and cleaned in PR_BRAND_MAPPING:
-        return PR_BRAND_MAPPING[cleaned]
-    elif media_type == "ads":
-        # Use specific key advantages mapping if this is key advantages data
-        if is_key_advantages_data and cleaned in ADS_KEY_ADVANTAGES_BRAND_MAPPING:
-            return ADS_KEY_ADVANTAGES_BRAND_MAPPING[cleaned]
-        # Use specific creativity mapping if this is creativity data
-        elif is_creativity_data and cleaned in ADS_CREATIVITY_BRAND_MAPPING:
-            return ADS_CREATIVITY_BRAND_MAPPING[cleaned]
-        elif cleaned in ADS_BRAND_MAPPING:
-            return ADS_BRAND_MAPPING[cleaned]
-    
-    # Fallback: return cleaned name
-    return cleaned
+    return _brand_mapping(media_type, bool(is_creativity_data), bool(is_key_advantages_data)).get(cleaned, cleaned)
+
+def normalize_brand_series(series, media_type: str, is_creativity_data: bool = False):
+    """Vectorized normalize_brand_name for a pandas Series: normalize each unique name once, then map"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Normalize the categories only and expand through the codes (code -1 = missing -> "")
+        normalized = np.array([normalize_brand_name(name, media_type, is_creativity_data) for name in series.cat.categories] + [""], dtype=object)
+        return pd.Series(normalized[series.cat.codes.to_numpy()], index=series.index, name=series.name)
+    mapping = {name: normalize_brand_name(name, media_type, is_creativity_data) for name in series.dropna().unique()}
+    return series.map(mapping).fillna("")
 
 def get_brand_column(media_type: str) -> str:
     """Get the brand column name for a media type"""
@@ -1,10 +1,14 @@
 # utils/date_utils.py
 import streamlit as st
 import os
+import re
 from datetime import datetime
 from calendar import month_name
 
+_MONTH_FOLDER_RE = re.compile(r"^(202\d|2030)-(0[1-9]|1[0-2])$")
+
 # Dynamically discover available months from dashboard_data folder
+@st.cache_data(ttl=600, show_spinner=False)
 def get_available_months():
     """Get available months from dashboard_data folder structure"""
     # Try different possible paths for dashboard_data
@@ -19,23 +23,19 @@ def get_available_months():
     available_months = []
     
     if data_root and os.path.exists(data_root):
-        for folder in os.listdir(data_root):
-            if os.path.isdir(os.path.join(data_root, folder)):
-                try:
-                    # Parse YYYY-MM format
-                    if len(folder) == 7 and folder[4] == '-':
-                        year = int(folder[:4])
-                        month = int(folder[5:7])
-                        if 2020 <= year <= 2030 and 1 <= month <= 12:
-                            available_months.append((year, month))
-                except (ValueError, IndexError):
-                    continue
+        # scandir reuses the directory entry's type instead of a stat per folder
+        with os.scandir(data_root) as entries:
+            for entry in entries:
+                # Parse YYYY-MM format (years 2020-2030)
+                match = _MONTH_FOLDER_RE.match(entry.name)
+                if match and entry.is_dir():
+                    available_months.append((int(match.group(1)), int(match.group(2))))
     
     # Sort by year, then month
     available_months.sort()
     return available_months
 
-# Get available months dynamically - this will be called each time
+# Get available months dynamically - the folder scan is cached for 10 minutes
 def get_available_months_list():
     """Get the list of available months, with fallback"""
     months = get_available_months()
@@ -1,9 +1,46 @@
 import os
+import re
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pandas as pd
 import streamlit as st
-from .config import DATA_ROOT  # <-- import here
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from .config import DATA_ROOT, get_brand_column, normalize_brand_series  # <-- import here
 from .date_utils import get_selected_date_range
 
+# Excel engine: the Rust-backed calamine reader when installed (pandas >= 2.2), else pandas' default (openpyxl)
+try:
+	import python_calamine  # noqa: F401
+	_EXCEL_ENGINE = "calamine" if tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2) else None
+except ImportError:
+	_EXCEL_ENGINE = None
+
+def _read_excel(path: str, sheet_name=0, **kwargs) -> pd.DataFrame:
+	"""pd.read_excel through the fastest available engine"""
+	return pd.read_excel(path, sheet_name=sheet_name, engine=_EXCEL_ENGINE, **kwargs)
+
+def _to_naive_datetime(values: pd.Series, utc: bool = True) -> pd.Series:
+	"""Timezone-naive datetime64 from a date column.
+
+	Columns that are already datetime64 are not parsed again. Strings are parsed as ISO-8601
+	first, falling back to per-element inference only if that leaves extra NaT. Aware values
+	are converted to UTC before the timezone is dropped when utc=True, otherwise their wall
+	time is kept.
+	"""
+	if pd.api.types.is_datetime64_any_dtype(values):
+		parsed = values
+	else:
+		parsed = pd.to_datetime(values, format="ISO8601", errors="coerce", utc=utc)
+		if parsed.isna().sum() > values.isna().sum():
+			parsed = pd.to_datetime(values, errors="coerce", utc=utc)
+	if parsed.dt.tz is not None:
+		if utc:
+			parsed = parsed.dt.tz_convert("UTC")
+		parsed = parsed.dt.tz_localize(None)
+	return parsed
+
 # ------------------------
 # 📄 Load Agility (News)
 # ------------------------
@@ -13,9 +50,11 @@ def load_agility_data(company_name: str):
     if not os.path.exists(path):
         return None
     try:
-        xls = pd.ExcelFile(path)
-        target_sheet = "Raw Data" if "Raw Data" in xls.sheet_names else xls.sheet_names[0]
-        df = pd.read_excel(xls, sheet_name=target_sheet)
+        try:
+            df = read_excel_via_parquet(path, sheet_name="Raw Data")
+        except ValueError:
+            # No "Raw Data" sheet - use the first one
+            df = read_excel_via_parquet(path)
     except Exception as e:
         st.error(f"[Agility] Error loading {company_name}: {e}")
         return None
@@ -62,15 +101,13 @@ def load_social_data(company_name: str, platform: str, use_consolidated: bool =
 			return None
 			
 		try:
-			df = pd.read_excel(path, sheet_name=0)
-			# Filter for the specific company
-			if company_col in df.columns:
-				df = df[df[company_col] == company_name].copy()
-				if df.empty:
-					return None
-			else:
+			# Only this company's rows; pushed down into the Parquet read once the sidecar exists
+			df = read_excel_via_parquet(path, equals=(company_col, company_name))
+			if company_col not in df.columns:
 				st.error(f"[Social] Company column '{company_col}' not found in {filename}")
 				return None
+			if df.empty:
+				return None
 		except Exception as e:
 			st.error(f"[Social] Error loading {platform} data for {company_name}: {e}")
 			return None
@@ -83,7 +120,7 @@ def load_social_data(company_name: str, platform: str, use_consolidated: bool =
 			return None
 
 		try:
-			df = pd.read_excel(path, sheet_name=0)
+			df = _read_excel(path, sheet_name=0)
 		except Exception as e:
 			st.error(f"[Social] Error loading {platform} data for {company_name}: {e}")
 			return None
@@ -91,14 +128,14 @@ def load_social_data(company_name: str, platform: str, use_consolidated: bool =
 	# Normalize datetime column
 	if "Published Date" not in df.columns:
 		if "date_posted" in df.columns:
-			df["Published Date"] = pd.to_datetime(df["date_posted"], utc=True, errors="coerce").dt.tz_localize(None)
+			df["Published Date"] = _to_naive_datetime(df["date_posted"])
 		elif "PublishedDate" in df.columns:
-			df["Published Date"] = pd.to_datetime(df["PublishedDate"], utc=True, errors="coerce").dt.tz_localize(None)
+			df["Published Date"] = _to_naive_datetime(df["PublishedDate"])
 		else:
 			st.warning(f"No recognizable date column in {filename}. Available columns: {list(df.columns)}")
 			return None
 	else:
-		df["Published Date"] = pd.to_datetime(df["Published Date"], utc=True, errors="coerce").dt.tz_localize(None)
+		df["Published Date"] = _to_naive_datetime(df["Published Date"])
 
 	return df
 
@@ -110,7 +147,7 @@ AGILITY_METADATA_PATH = os.path.join(DATA_ROOT, "agility", "agility_metadata.xls
 
 def load_agility_volume_map():
 	if os.path.exists(AGILITY_METADATA_PATH):
-		return pd.read_excel(AGILITY_METADATA_PATH, index_col="Company").to_dict()["Volume"]
+		return _read_excel(AGILITY_METADATA_PATH, index_col="Company").to_dict()["Volume"]
 	else:
 		return {}
 
@@ -138,17 +175,14 @@ def load_all_social_data(brands, platform: str, use_consolidated: bool = False):
 # 📢 Load Ads Intelligence data
 # ------------------------
 
-@st.cache_data
-def load_ads_data():
-	"""
-	Load ads scraping Excel and normalize key fields.
-	Returns a pandas DataFrame or None if not found.
-	"""
+@lru_cache(maxsize=4)
+def _ads_candidate_paths(cwd: str) -> tuple:
+	"""Ads workbook locations to try, in order; the list depends only on the working directory"""
 	# Build potential roots: configured root, module-relative root, and CWD/data
 	module_dir = os.path.dirname(os.path.abspath(__file__))
 	project_root = os.path.abspath(os.path.join(module_dir, os.pardir))
 	module_data_root = os.path.join(project_root, "data")
-	cwd_data_root = os.path.join(os.getcwd(), "data")
+	cwd_data_root = os.path.join(cwd, "data")
 	roots = [DATA_ROOT, module_data_root, cwd_data_root]
 
 	candidate_filenames = [
@@ -163,16 +197,21 @@ def load_ads_data():
 		candidate_paths.extend([os.path.join(root, "ads", fname) for fname in candidate_filenames])
 
 	# Deduplicate while preserving order
-	seen = set()
-	candidate_paths = [p for p in candidate_paths if not (p in seen or seen.add(p))]
+	return tuple(dict.fromkeys(candidate_paths))
 
-	path = next((p for p in candidate_paths if os.path.exists(p)), None)
+@st.cache_data
+def load_ads_data():
+	"""
+	Load ads scraping Excel and normalize key fields.
+	Returns a pandas DataFrame or None if not found.
+	"""
+	path = next((p for p in _ads_candidate_paths(os.getcwd()) if os.path.exists(p)), None)
 	if path is None:
 		st.warning("Ads data file not found in expected locations.")
 		return None
 
 	try:
-		df = pd.read_excel(path, sheet_name=0)
+		df = _read_excel(path, sheet_name=0)
 	except Exception as e:
 		st.error(f"[Ads] Error loading ads data: {e}")
 		return None
@@ -180,7 +219,7 @@ def load_ads_data():
 	# Normalize dates
 	for col in ["startDateFormatted", "endDateFormatted"]:
 		if col in df.columns:
-			df[col] = pd.to_datetime(df[col], utc=True, errors="coerce").dt.tz_localize(None)
+			df[col] = _to_naive_datetime(df[col])
 
 	# Normalize numeric reach
 	reach_col = "ad_details/aaa_info/eu_total_reach"
@@ -225,60 +264,12 @@ def load_audience_affinity_outputs():
 			start_date = None
 			end_date = None
 		
+		# Merge the monthly outputs; the first month that has a key wins
+		month_outputs = [month_data for month_data in _collect_monthly(start_date, end_date, os.path.join("social_media", "analysis", "audience_affinity", "audience_affinity_outputs.pkl"), "audience affinity data", reader=_read_pickle) if isinstance(month_data, dict)]
 		all_data = {}
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load audience affinity outputs
-				audience_affinity_path = os.path.join(DATA_ROOT, month_folder, "social_media", "analysis", "audience_affinity", "audience_affinity_outputs.pkl")
-				if os.path.exists(audience_affinity_path):
-					try:
-						import pickle
-						with open(audience_affinity_path, 'rb') as f:
-							month_data = pickle.load(f)
-							# Merge data from this month (audience affinity data structure is different)
-							if isinstance(month_data, dict):
-								for key, value in month_data.items():
-									if key not in all_data:
-										all_data[key] = value
-					except Exception as e:
-						if 'st' in globals():
-							st.warning(f"Could not load audience affinity data for {month_folder}: {e}")
-						else:
-							print(f"Could not load audience affinity data for {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						audience_affinity_path = os.path.join(DATA_ROOT, folder, "social_media", "analysis", "audience_affinity", "audience_affinity_outputs.pkl")
-						if os.path.exists(audience_affinity_path):
-							try:
-								import pickle
-								with open(audience_affinity_path, 'rb') as f:
-									month_data = pickle.load(f)
-									# Merge data from this month (audience affinity data structure is different)
-									if isinstance(month_data, dict):
-										for key, value in month_data.items():
-											if key not in all_data:
-												all_data[key] = value
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load audience affinity data for {folder}: {e}")
-								else:
-									print(f"Could not load audience affinity data for {folder}: {e}")
+		for month_data in month_outputs:
+			for key, value in month_data.items():
+				all_data.setdefault(key, value)
 		
 		if all_data:
 			return all_data
@@ -310,58 +301,12 @@ def load_content_pillar_outputs():
 			start_date = None
 			end_date = None
 		
+		# Merge the monthly outputs; the first month that has a key wins
+		month_outputs = [month_data for month_data in _collect_monthly(start_date, end_date, os.path.join("social_media", "analysis", "content_pillars", "content_pillar_outputs.pkl"), "content pillar data", reader=_read_pickle) if isinstance(month_data, dict)]
 		all_data = {}
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load content pillar outputs
-				content_pillars_path = os.path.join(DATA_ROOT, month_folder, "social_media", "analysis", "content_pillars", "content_pillar_outputs.pkl")
-				if os.path.exists(content_pillars_path):
-					try:
-						import pickle
-						with open(content_pillars_path, 'rb') as f:
-							month_data = pickle.load(f)
-							# Merge data from this month
-							for brand, data in month_data.items():
-								if brand not in all_data:
-									all_data[brand] = data
-					except Exception as e:
-						if 'st' in globals():
-							st.warning(f"Could not load content pillar data for {month_folder}: {e}")
-						else:
-							print(f"Could not load content pillar data for {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						content_pillars_path = os.path.join(DATA_ROOT, folder, "social_media", "analysis", "content_pillars", "content_pillar_outputs.pkl")
-						if os.path.exists(content_pillars_path):
-							try:
-								import pickle
-								with open(content_pillars_path, 'rb') as f:
-									month_data = pickle.load(f)
-									# Merge data from this month
-									for brand, data in month_data.items():
-										if brand not in all_data:
-											all_data[brand] = data
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load content pillar data for {folder}: {e}")
-								else:
-									print(f"Could not load content pillar data for {folder}: {e}")
+		for month_data in month_outputs:
+			for key, value in month_data.items():
+				all_data.setdefault(key, value)
 		
 		if all_data:
 			return all_data
@@ -381,10 +326,155 @@ def load_content_pillar_outputs():
 # 📊 Load Monthly Dashboard Data
 # ------------------------
 
+def read_excel_via_parquet(path: str, sheet_name=0, equals=None) -> pd.DataFrame:
+	"""Read an Excel file through a Parquet copy stored next to it.
+
+	The Parquet copy is (re)written from the workbook whenever it is missing or older
+	than the workbook. If it cannot be written (no pyarrow, mixed-type columns, read-only
+	folder) the workbook is simply read with pd.read_excel. One copy is kept per workbook,
+	so callers must always read the same sheet of a given file.
+
+	equals=(column, value) keeps only the rows where column == value; on the Parquet path
+	the filter is applied inside the read, so other rows are never materialized.
+	"""
+	parquet_path = os.path.splitext(path)[0] + ".parquet"
+	if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(path):
+		try:
+			return pd.read_parquet(parquet_path, filters=[(equals[0], "==", equals[1])] if equals else None)
+		except Exception:
+			pass
+
+	df = _read_excel(path, sheet_name=sheet_name)
+	# Write under a name unique to this thread and rename into place, so a concurrent
+	# reader never opens a half-written copy and two writers never share a file
+	tmp_path = f"{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+	try:
+		df.to_parquet(tmp_path, compression="zstd", index=False)
+		os.replace(tmp_path, parquet_path)
+	except Exception:
+		if os.path.exists(tmp_path):
+			os.remove(tmp_path)
+	if equals and equals[0] in df.columns:
+		df = df[df[equals[0]] == equals[1]].reset_index(drop=True)
+	return df
+
 def get_month_folder_name(year: int, month: int) -> str:
 	"""Generate folder name in YYYY-MM format"""
 	return f"{year}-{month:02d}"
 
+def _iter_month_folders(start_date=None, end_date=None):
+	"""Yield YYYY-MM month folder names in DATA_ROOT for [start_date, end_date), or every month folder without a range"""
+	if not os.path.exists(DATA_ROOT):
+		return
+	available = _discover_month_folders(DATA_ROOT, os.stat(DATA_ROOT).st_mtime_ns)
+	if start_date and end_date:
+		# Only months that have a folder, so a wide range does not stat a path per missing month
+		available = set(available)
+		current_date = start_date
+		while current_date < end_date:
+			month_folder = get_month_folder_name(current_date.year, current_date.month)
+			if month_folder in available:
+				yield month_folder
+			# Move to next month
+			if current_date.month == 12:
+				current_date = current_date.replace(year=current_date.year + 1, month=1)
+			else:
+				current_date = current_date.replace(month=current_date.month + 1)
+	else:
+		yield from available
+
+_MONTH_FOLDER_RE = re.compile(r"\d{4}-\d{2}")
+
+@lru_cache(maxsize=8)
+def _discover_month_folders(data_root: str, mtime_ns: int) -> tuple:
+	"""YYYY-MM folders in data_root; memoized on the directory mtime, which changes when a folder is added or removed"""
+	with os.scandir(data_root) as entries:
+		return tuple(sorted(entry.name for entry in entries if _MONTH_FOLDER_RE.fullmatch(entry.name) and entry.is_dir()))
+
+def _read_pickle(path: str):
+	"""Unpickle one monthly analysis output"""
+	with open(path, 'rb') as f:
+		return pickle.load(f)
+
+def _collect_monthly(start_date, end_date, relative_path: str, label: str, reader=_read_excel) -> list:
+	"""Read DATA_ROOT/<month>/<relative_path> for every month folder that has it.
+
+	DataFrames get a 'month' column with the folder name. A file that fails to read
+	is reported with st.warning and skipped.
+	"""
+	paths = {}
+	for month_folder in _iter_month_folders(start_date, end_date):
+		path = os.path.join(DATA_ROOT, month_folder, relative_path)
+		if os.path.exists(path):
+			paths[month_folder] = path
+	if not paths:
+		return []
+	
+	def read_month(path):
+		try:
+			return reader(path), None
+		except Exception as e:
+			return None, e
+	
+	# Months are independent files, so read several at once; warnings are raised back on this thread in month order
+	ctx = get_script_run_ctx()
+	with ThreadPoolExecutor(max_workers=min(8, len(paths)), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+		outcomes = list(executor.map(read_month, paths.values()))
+	
+	results = []
+	for month_folder, (data, error) in zip(paths, outcomes):
+		if error is not None:
+			st.warning(f"Could not load {label} for {month_folder}: {error}")
+			continue
+		if isinstance(data, pd.DataFrame):
+			data['month'] = month_folder
+		results.append(data)
+	return results
+
+def _concat_monthly(frames: list) -> pd.DataFrame:
+	"""Stack the per-month frames; a single month (the usual selection) is returned as is, without a copy"""
+	result = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True, copy=False)
+	# The folder tag repeats one string per row; store it as a category
+	if 'month' in result.columns:
+		result['month'] = result['month'].astype('category')
+	return result
+
+# Per-month files the loaders read for a media type (master data plus the analyses keyed on it)
+_MTIME_FILES = (
+	os.path.join("{media_type}", "{media_type}_master_data.xlsx"),
+	os.path.join("{media_type}", "analysis", "compos", "compos_analysis_{media_type}.xlsx"),
+	os.path.join("{media_type}", "analysis", "creativity", "creativity_analysis_{media_type}.xlsx"),
+)
+
+def get_monthly_data_mtime(media_type: str) -> tuple:
+	"""(relative path, mtime) of every existing monthly file of a media type in the selected range, for use as a cache key.
+
+	Unlike the newest mtime alone, the key also changes when a file is deleted or a file with an older mtime is added.
+	"""
+	# Same range as the loaders: the selected months, or every month folder without a selection
+	try:
+		start_date, end_date = get_selected_date_range()
+	except:
+		start_date = None
+		end_date = None
+	relative_paths = [template.format(media_type=media_type) for template in _MTIME_FILES]
+	key = []
+	for month_folder in _iter_month_folders(start_date, end_date):
+		for relative_path in relative_paths:
+			path = os.path.join(month_folder, relative_path)
+			try:
+				key.append((path, os.path.getmtime(os.path.join(DATA_ROOT, path))))
+			except OSError:
+				pass
+	return tuple(key)
+
+def slice_date_range(df: pd.DataFrame, start_date, end_date, col: str = "date") -> pd.DataFrame:
+	"""Rows with start_date <= df[col] <= end_date, for a frame sorted by col (the monthly loaders sort at load)"""
+	dates = df[col]
+	lo = dates.searchsorted(pd.Timestamp(start_date), side="left")
+	hi = dates.searchsorted(pd.Timestamp(end_date), side="right")
+	return df.iloc[lo:hi]
+
 @st.cache_data
 def load_monthly_ads_data():
 	"""Load ads data from dashboard_data monthly folders"""
@@ -397,53 +487,10 @@ def load_monthly_ads_data():
 			start_date = None
 			end_date = None
 		
-		all_data = []
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load ads master data
-				ads_path = os.path.join(DATA_ROOT, month_folder, "ads", "ads_master_data.xlsx")
-				if os.path.exists(ads_path):
-					try:
-						df = pd.read_excel(ads_path)
-						df['month'] = month_folder
-						all_data.append(df)
-					except Exception as e:
-						if 'st' in globals():
-							st.warning(f"Could not load ads data for {month_folder}: {e}")
-						else:
-							print(f"Could not load ads data for {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						ads_path = os.path.join(DATA_ROOT, folder, "ads", "ads_master_data.xlsx")
-						if os.path.exists(ads_path):
-							try:
-								df = pd.read_excel(ads_path)
-								df['month'] = folder
-								all_data.append(df)
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load ads data for {folder}: {e}")
-								else:
-									print(f"Could not load ads data for {folder}: {e}")
+		all_data = _collect_monthly(start_date, end_date, os.path.join("ads", "ads_master_data.xlsx"), "ads data", reader=read_excel_via_parquet)
 		
 		if all_data:
-			result = pd.concat(all_data, ignore_index=True)
+			result = _concat_monthly(all_data)
 			
 			# Standardize column names for ads data
 			if 'ad_details/aaa_info/eu_total_reach' in result.columns:
@@ -472,87 +519,57 @@ def load_monthly_ads_data():
 			print(f"Error loading monthly ads data: {e}")
 		return pd.DataFrame()
 
-@st.cache_data
 def load_monthly_social_media_data():
 	"""Load social media data from dashboard_data monthly folders"""
+	# Try to get selected date range, fallback to all available months
 	try:
-		# Try to get selected date range, fallback to all available months
-		try:
-			start_date, end_date = get_selected_date_range()
-		except:
-			# Fallback: load all available months
-			start_date = None
-			end_date = None
-		
-		all_data = []
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load social media master data
-				social_path = os.path.join(DATA_ROOT, month_folder, "social_media", "social_media_master_data.xlsx")
-				if os.path.exists(social_path):
-					try:
-						df = pd.read_excel(social_path)
-						df['month'] = month_folder
-						all_data.append(df)
-					except Exception as e:
-						if 'st' in globals():
-							st.warning(f"Could not load social media data for {month_folder}: {e}")
-						else:
-							print(f"Could not load social media data for {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						social_path = os.path.join(DATA_ROOT, folder, "social_media", "social_media_master_data.xlsx")
-						if os.path.exists(social_path):
-							try:
-								df = pd.read_excel(social_path)
-								df['month'] = folder
-								all_data.append(df)
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load social media data for {folder}: {e}")
-								else:
-									print(f"Could not load social media data for {folder}: {e}")
+		start_date, end_date = get_selected_date_range()
+	except:
+		start_date = None
+		end_date = None
+	return _load_monthly_social_media_data(start_date, end_date, get_monthly_data_mtime("social_media"))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_monthly_social_media_data(start_date, end_date, mtime: tuple):
+	"""Cached worker for load_monthly_social_media_data, keyed on the date range and file mtimes"""
+	try:
+		all_data = _collect_monthly(start_date, end_date, os.path.join("social_media", "social_media_master_data.xlsx"), "social media data", reader=read_excel_via_parquet)
 		
 		if all_data:
-			result = pd.concat(all_data, ignore_index=True)
+			result = _concat_monthly(all_data)
 			
 			# Standardize column names for social media data
 			# Calculate engagement from individual metrics
 			if 'likes' in result.columns and 'num_comments' in result.columns and 'num_shares' in result.columns:
-				# Calculate total engagement: likes + comments*3 + shares*5
-				likes = pd.to_numeric(result['likes'], errors='coerce').fillna(0)
-				comments = pd.to_numeric(result['num_comments'], errors='coerce').fillna(0)
-				shares = pd.to_numeric(result['num_shares'], errors='coerce').fillna(0)
-				result['calculated_engagement'] = likes + comments * 3 + shares * 5
+				# Store the counts as int32 and total engagement (likes + comments*3 + shares*5) as int64
+				for col in ['likes', 'num_comments', 'num_shares']:
+					result[col] = pd.to_numeric(result[col], errors='coerce').fillna(0).astype('int32')
+				result['calculated_engagement'] = (
+					result['likes'].astype('int64')
+					+ result['num_comments'].astype('int64') * 3
+					+ result['num_shares'].astype('int64') * 5
+				)
 			elif 'total_engagement' in result.columns:
-				result['calculated_engagement'] = pd.to_numeric(result['total_engagement'], errors='coerce').fillna(0)
+				result['calculated_engagement'] = pd.to_numeric(result['total_engagement'], errors='coerce').fillna(0).astype('int64')
 			else:
 				result['calculated_engagement'] = 0  # Default to 0 if no engagement data
 			
 			# Add standardized date column
 			if 'date_posted' in result.columns:
-				result['date'] = pd.to_datetime(result['date_posted'], errors='coerce').dt.tz_localize(None)
+				result['date'] = _to_naive_datetime(result['date_posted'], utc=False)
 			elif 'created_date' in result.columns:
-				result['date'] = pd.to_datetime(result['created_date'], errors='coerce').dt.tz_localize(None)
+				result['date'] = _to_naive_datetime(result['created_date'], utc=False)
 			else:
 				result['date'] = pd.NaT
 			
+			# Sort by date once so sections can slice a date range with searchsorted
+			result = result.sort_values('date', kind='stable', ignore_index=True)
+			
+			# Low-cardinality string columns as categoricals (group with observed=True)
+			for col in [get_brand_column("social_media"), 'cluster_1']:
+				if col in result.columns:
+					result[col] = result[col].astype('category')
+			
 			return result
 		else:
 			return pd.DataFrame()
@@ -564,65 +581,47 @@ def load_monthly_social_media_data():
 			print(f"Error loading monthly social media data: {e}")
 		return pd.DataFrame()
 
-@st.cache_data
+def load_selected_social_media_data():
+	"""Monthly social media data for the selected date range and brands, with a 'normalized_company' column.
+
+	Returns None when there is no social media data at all.
+	"""
+	start_date, end_date = get_selected_date_range()
+	selected_brands = tuple(st.session_state.get("selected_brands", []))
+	return _load_selected_social_media_data(start_date, end_date, selected_brands, get_monthly_data_mtime("social_media"))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_selected_social_media_data(start_date, end_date, selected_brands: tuple, mtime: tuple):
+	"""Cached worker for load_selected_social_media_data, shared by the sections that filter the same way"""
+	df = _load_monthly_social_media_data(start_date, end_date, mtime)
+	if df is None or df.empty:
+		return None
+	
+	# 'date' is made timezone-naive at load time, so the naive range bounds compare directly
+	df_filtered = slice_date_range(df, start_date, end_date).copy()
+	df_filtered['normalized_company'] = normalize_brand_series(df_filtered[get_brand_column("social_media")], "social_media")
+	if selected_brands:
+		df_filtered = df_filtered[df_filtered['normalized_company'].isin(selected_brands)]
+	return df_filtered
+
 def load_monthly_pr_data():
 	"""Load PR data from dashboard_data monthly folders"""
+	# Try to get selected date range, fallback to all available months
 	try:
-		# Try to get selected date range, fallback to all available months
-		try:
-			start_date, end_date = get_selected_date_range()
-		except:
-			# Fallback: load all available months
-			start_date = None
-			end_date = None
-		
-		all_data = []
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load PR master data
-				pr_path = os.path.join(DATA_ROOT, month_folder, "pr", "pr_master_data.xlsx")
-				if os.path.exists(pr_path):
-					try:
-						df = pd.read_excel(pr_path)
-						df['month'] = month_folder
-						all_data.append(df)
-					except Exception as e:
-						if 'st' in globals():
-							st.warning(f"Could not load PR data for {month_folder}: {e}")
-						else:
-							print(f"Could not load PR data for {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						pr_path = os.path.join(DATA_ROOT, folder, "pr", "pr_master_data.xlsx")
-						if os.path.exists(pr_path):
-							try:
-								df = pd.read_excel(pr_path)
-								df['month'] = folder
-								all_data.append(df)
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load PR data for {folder}: {e}")
-								else:
-									print(f"Could not load PR data for {folder}: {e}")
+		start_date, end_date = get_selected_date_range()
+	except:
+		start_date = None
+		end_date = None
+	return _load_monthly_pr_data(start_date, end_date, get_monthly_data_mtime("pr"))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_monthly_pr_data(start_date, end_date, mtime: tuple):
+	"""Cached worker for load_monthly_pr_data, keyed on the date range and file mtimes"""
+	try:
+		all_data = _collect_monthly(start_date, end_date, os.path.join("pr", "pr_master_data.xlsx"), "PR data", reader=read_excel_via_parquet)
 		
 		if all_data:
-			result = pd.concat(all_data, ignore_index=True)
+			result = _concat_monthly(all_data)
 			
 			# Standardize column names for PR data
 			# Use Impressions as reach metric for PR
@@ -637,6 +636,14 @@ def load_monthly_pr_data():
 			else:
 				result['date'] = pd.NaT
 			
+			# Sort by date once so sections can slice a date range with searchsorted
+			result = result.sort_values('date', kind='stable', ignore_index=True)
+			
+			# Low-cardinality string columns as categoricals (group with observed=True)
+			for col in ['company', 'Sentiment']:
+				if col in result.columns:
+					result[col] = result[col].astype('category')
+			
 			return result
 		else:
 			return pd.DataFrame()
@@ -652,33 +659,12 @@ def load_creativity_analysis(media_type: str):
 	"""Load creativity analysis from dashboard_data monthly folders - ONLY from selected month"""
 	try:
 		start_date, end_date = get_selected_date_range()
-		all_data = []
 		
 		# Load ONLY from selected date range - no fallbacks
-		current_date = start_date
-		while current_date < end_date:
-			year = current_date.year
-			month = current_date.month
-			month_folder = get_month_folder_name(year, month)
-			
-			# Try to load creativity analysis
-			creativity_path = os.path.join(DATA_ROOT, month_folder, media_type, "analysis", "creativity", f"creativity_analysis_{media_type}.xlsx")
-			if os.path.exists(creativity_path):
-				try:
-					df = pd.read_excel(creativity_path)
-					df['month'] = month_folder
-					all_data.append(df)
-				except Exception as e:
-					st.warning(f"Could not load creativity data for {media_type} in {month_folder}: {e}")
-			
-			# Move to next month
-			if month == 12:
-				current_date = current_date.replace(year=year + 1, month=1)
-			else:
-				current_date = current_date.replace(month=month + 1)
+		all_data = _collect_monthly(start_date, end_date, os.path.join(media_type, "analysis", "creativity", f"creativity_analysis_{media_type}.xlsx"), f"creativity data for {media_type}")
 		
 		if all_data:
-			return pd.concat(all_data, ignore_index=True)
+			return _concat_monthly(all_data)
 		else:
 			return pd.DataFrame()
 			
@@ -686,62 +672,24 @@ def load_creativity_analysis(media_type: str):
 		st.error(f"Error loading creativity analysis for {media_type}: {e}")
 		return pd.DataFrame()
 
-@st.cache_data
 def load_compos_analysis(media_type: str):
 	"""Load compos analysis from dashboard_data monthly folders"""
+	# Try to get selected date range, fallback to all available months
 	try:
-		# Try to get selected date range, fallback to all available months
-		try:
-			start_date, end_date = get_selected_date_range()
-		except:
-			# Fallback: load all available months
-			start_date = None
-			end_date = None
-		
-		all_data = []
-		
-		if start_date and end_date:
-			# Use selected date range
-			current_date = start_date
-			while current_date < end_date:
-				year = current_date.year
-				month = current_date.month
-				month_folder = get_month_folder_name(year, month)
-				
-				# Try to load compos analysis
-				compos_path = os.path.join(DATA_ROOT, month_folder, media_type, "analysis", "compos", f"compos_analysis_{media_type}.xlsx")
-				if os.path.exists(compos_path):
-					try:
-						df = pd.read_excel(compos_path)
-						df['month'] = month_folder
-						all_data.append(df)
-					except Exception as e:
-						st.warning(f"Could not load compos data for {media_type} in {month_folder}: {e}")
-				
-				# Move to next month
-				if month == 12:
-					current_date = current_date.replace(year=year + 1, month=1)
-				else:
-					current_date = current_date.replace(month=month + 1)
-		else:
-			# Load all available months
-			if os.path.exists(DATA_ROOT):
-				for folder in os.listdir(DATA_ROOT):
-					if os.path.isdir(os.path.join(DATA_ROOT, folder)) and len(folder) == 7 and folder[4] == '-':
-						compos_path = os.path.join(DATA_ROOT, folder, media_type, "analysis", "compos", f"compos_analysis_{media_type}.xlsx")
-						if os.path.exists(compos_path):
-							try:
-								df = pd.read_excel(compos_path)
-								df['month'] = folder
-								all_data.append(df)
-							except Exception as e:
-								if 'st' in globals():
-									st.warning(f"Could not load compos data for {media_type} in {folder}: {e}")
-								else:
-									print(f"Could not load compos data for {media_type} in {folder}: {e}")
+		start_date, end_date = get_selected_date_range()
+	except:
+		start_date = None
+		end_date = None
+	return _load_compos_analysis(media_type, start_date, end_date, get_monthly_data_mtime(media_type))
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_compos_analysis(media_type: str, start_date, end_date, mtime: tuple):
+	"""Cached worker for load_compos_analysis, keyed on the date range and file mtimes"""
+	try:
+		all_data = _collect_monthly(start_date, end_date, os.path.join(media_type, "analysis", "compos", f"compos_analysis_{media_type}.xlsx"), f"compos data for {media_type}")
 		
 		if all_data:
-			return pd.concat(all_data, ignore_index=True)
+			return _concat_monthly(all_data)
 		else:
 			return pd.DataFrame()
 			
@@ -4,12 +4,13 @@ Simple analysis runner that uses the month configured in config.py
 import os
 import sys
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import ANALYSIS_YEAR, ANALYSIS_MONTH, MEDIA_TYPES, ANALYSIS_TYPES, ANALYSIS_CONTROL
-from utils.folder_manager import get_monthly_folders, ensure_analysis_folder
+from utils.folder_manager import compute_monthly_folders, ensure_analysis_folder
 from utils.data_processor import load_new_data, append_monthly_data, validate_data_structure, clean_data
 from analysis.ads.compos_analysis import analyze_compos_for_month as analyze_ads_compos
 from analysis.ads.creativity_analysis import analyze_creativity_for_month as analyze_ads_creativity
@@ -22,6 +23,111 @@ from analysis.pr.compos_analysis import analyze_compos_for_month as analyze_pr_c
 from analysis.pr.creativity_analysis import analyze_creativity_for_month as analyze_pr_creativity
 from analysis.pr.agility_analysis import analyze_agility_for_month as analyze_pr_agility
 
+# Analysis type -> {media type: analyze function}, run in this order for each media type
+ANALYSIS_DISPATCH = {
+    "compos": {"ads": analyze_ads_compos, "social_media": analyze_social_compos, "pr": analyze_pr_compos},
+    "creativity": {"ads": analyze_ads_creativity, "social_media": analyze_social_creativity, "pr": analyze_pr_creativity},
+    "key_advantages": {"ads": analyze_ads_key_advantages},
+    "content_pillars": {"social_media": analyze_social_content_pillars},
+    "audience_affinity": {"social_media": analyze_social_audience_affinity},
+    "agility": {"pr": analyze_pr_agility},
+}
+
+def process_media_type(media_type: str) -> dict:
+    """Load, clean and analyze one media type for the configured month; returns its part of the run results"""
+    results = {
+        "processed_data": {},
+        "analyses": {},
+        "errors": []
+    }
+    
+    print(f"\n--- Processing {media_type.upper()} ---")
+    
+    # Special handling for PR with agility analysis
+    if media_type == "pr" and ANALYSIS_CONTROL.get("pr_agility", False):
+        print("Using agility data merge instead of standard PR data loading")
+        # Skip the normal data loading for PR when agility is enabled
+        # The agility analysis will create the master file directly
+    else:
+        try:
+            # Load and filter data for the configured month
+            new_data = load_new_data(media_type, ANALYSIS_YEAR, ANALYSIS_MONTH)
+            
+            if len(new_data) == 0:
+                print(f"No {media_type} data found for {ANALYSIS_YEAR}-{ANALYSIS_MONTH:02d}")
+                return results
+            
+            # Validate data structure
+            validation = validate_data_structure(new_data, media_type)
+            if not validation["valid"]:
+                error_msg = f"Data validation failed for {media_type}: {validation}"
+                print(f"[ERROR] {error_msg}")
+                results["errors"].append(error_msg)
+                return results
+            
+            # Clean data
+            cleaned_data = clean_data(new_data, media_type)
+            print(f"[OK] Loaded and cleaned {len(cleaned_data)} {media_type} items")
+            
+            # Append to dashboard data
+            output_file = append_monthly_data(
+                ANALYSIS_YEAR, ANALYSIS_MONTH, media_type, cleaned_data, overwrite=False
+            )
+            results["processed_data"][media_type] = output_file
+            print(f"[OK] Saved to: {os.path.basename(output_file)}")
+            
+        except Exception as e:
+            error_msg = f"Failed to process {media_type} data: {e}"
+            print(f"[ERROR] {error_msg}")
+            results["errors"].append(error_msg)
+            return results
+    
+    # Run analyses for this media type based on config
+    print(f"\nRunning analyses for {media_type}...")
+    results["analyses"][media_type] = {}
+    
+    # Check which analyses are enabled for this media type
+    enabled_for_media = [key for key, value in ANALYSIS_CONTROL.items() 
+                       if value and key.startswith(media_type)]
+    
+    if not enabled_for_media:
+        print(f"  No analyses enabled for {media_type}")
+        return results
+    
+    for analysis_type, analyzers in ANALYSIS_DISPATCH.items():
+        if not ANALYSIS_CONTROL.get(f"{media_type}_{analysis_type}", False):
+            continue
+        analysis_name = ANALYSIS_TYPES[analysis_type]["name"]
+        try:
+            print(f"  - {analysis_name}...")
+            analyze = analyzers.get(media_type)
+            if analyze is None:
+                print(f"    [SKIP] {analysis_name} not implemented for {media_type}")
+                continue
+            
+            if analysis_type == "agility":
+                # The agility merge writes the PR master file itself, not into an analysis folder
+                output = analyze(ANALYSIS_YEAR, ANALYSIS_MONTH)
+            else:
+                analysis_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, analysis_type, media_type)
+                output = analyze(ANALYSIS_YEAR, ANALYSIS_MONTH, analysis_folder)
+            
+            if output:
+                results["analyses"][media_type][analysis_type] = output
+                if analysis_type == "agility":
+                    results["processed_data"][media_type] = output  # Mark as processed data
+                print(f"    [OK] Saved: {os.path.basename(output)}")
+            else:
+                error_msg = f"{analysis_name} failed for {media_type} - no output file"
+                print(f"    [ERROR] {error_msg}")
+                results["errors"].append(error_msg)
+        except Exception as e:
+            error_msg = f"{analysis_name} failed for {media_type}: {e}"
+            print(f"    [ERROR] {error_msg}")
+            results["errors"].append(error_msg)
+    
+    return results
+
 def main():
     """Run analysis for the configured month"""
     print("=" * 60)
@@ -51,9 +157,9 @@ def main():
         print(f"[ERROR] Error loading configuration: {e}")
     print()
     
-    # Create monthly folders
-    folders = get_monthly_folders(ANALYSIS_YEAR, ANALYSIS_MONTH)
-    print(f"Created/verified folders for {ANALYSIS_YEAR}-{ANALYSIS_MONTH:02d}")
+    # Monthly folder paths; each analysis creates the folder it writes into, so disabled ones leave no empty folders
+    folders = compute_monthly_folders(ANALYSIS_YEAR, ANALYSIS_MONTH)
+    print(f"Output folder for {ANALYSIS_YEAR}-{ANALYSIS_MONTH:02d}: {folders['month_root']}")
     
     results = {
         "processed_data": {},
@@ -84,216 +190,12 @@ def main():
     print(f"Processing media types: {', '.join(media_types_to_process)}")
     print()
     
-    # Process each media type that has enabled analyses
-    for media_type in media_types_to_process:
-        print(f"\n--- Processing {media_type.upper()} ---")
-        
-        # Special handling for PR with agility analysis
-        if media_type == "pr" and ANALYSIS_CONTROL.get("pr_agility", False):
-            print("Using agility data merge instead of standard PR data loading")
-            # Skip the normal data loading for PR when agility is enabled
-            # The agility analysis will create the master file directly
-        else:
-            try:
-                # Load and filter data for the configured month
-                new_data = load_new_data(media_type, ANALYSIS_YEAR, ANALYSIS_MONTH)
-                
-                if len(new_data) == 0:
-                    print(f"No {media_type} data found for {ANALYSIS_YEAR}-{ANALYSIS_MONTH:02d}")
-                    continue
-                
-                # Validate data structure
-                validation = validate_data_structure(new_data, media_type)
-                if not validation["valid"]:
-                    error_msg = f"Data validation failed for {media_type}: {validation}"
-                    print(f"[ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-                    continue
-                
-                # Clean data
-                cleaned_data = clean_data(new_data, media_type)
-                print(f"[OK] Loaded and cleaned {len(cleaned_data)} {media_type} items")
-                
-                # Append to dashboard data
-                output_file = append_monthly_data(
-                    ANALYSIS_YEAR, ANALYSIS_MONTH, media_type, cleaned_data, overwrite=False
-                )
-                results["processed_data"][media_type] = output_file
-                print(f"[OK] Saved to: {os.path.basename(output_file)}")
-                
-            except Exception as e:
-                error_msg = f"Failed to process {media_type} data: {e}"
-                print(f"[ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-                continue
-        
-        # Run analyses for this media type based on config
-        print(f"\nRunning analyses for {media_type}...")
-        results["analyses"][media_type] = {}
-        
-        # Check which analyses are enabled for this media type
-        enabled_for_media = [key for key, value in ANALYSIS_CONTROL.items() 
-                           if value and key.startswith(media_type)]
-        
-        if not enabled_for_media:
-            print(f"  No analyses enabled for {media_type}")
-            continue
-        
-        # CompOS Analysis
-        if f"{media_type}_compos" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_compos"]:
-            try:
-                print("  - CompOS Analysis...")
-                compos_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, "compos", media_type)
-                
-                # Use appropriate function based on media type
-                if media_type == "ads":
-                    compos_output = analyze_ads_compos(ANALYSIS_YEAR, ANALYSIS_MONTH, compos_folder)
-                elif media_type == "social_media":
-                    compos_output = analyze_social_compos(ANALYSIS_YEAR, ANALYSIS_MONTH, compos_folder)
-                elif media_type == "pr":
-                    compos_output = analyze_pr_compos(ANALYSIS_YEAR, ANALYSIS_MONTH, compos_folder)
-                else:
-                    print(f"    [SKIP] CompOS analysis not implemented for {media_type}")
-                    continue
-                
-                if compos_output:
-                    results["analyses"][media_type]["compos"] = compos_output
-                    print(f"    [OK] Saved: {os.path.basename(compos_output)}")
-                else:
-                    error_msg = f"CompOS analysis failed for {media_type} - no output file"
-                    print(f"    [ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-            except Exception as e:
-                error_msg = f"CompOS analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-        
-        # Creativity Analysis
-        if f"{media_type}_creativity" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_creativity"]:
-            try:
-                print("  - Creativity Analysis...")
-                creativity_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, "creativity", media_type)
-                
-                # Use appropriate function based on media type
-                if media_type == "ads":
-                    creativity_output = analyze_ads_creativity(ANALYSIS_YEAR, ANALYSIS_MONTH, creativity_folder)
-                elif media_type == "social_media":
-                    creativity_output = analyze_social_creativity(ANALYSIS_YEAR, ANALYSIS_MONTH, creativity_folder)
-                elif media_type == "pr":
-                    creativity_output = analyze_pr_creativity(ANALYSIS_YEAR, ANALYSIS_MONTH, creativity_folder)
-                else:
-                    print(f"    [SKIP] Creativity analysis not implemented for {media_type}")
-                    continue
-                
-                if creativity_output:
-                    results["analyses"][media_type]["creativity"] = creativity_output
-                    print(f"    [OK] Saved: {os.path.basename(creativity_output)}")
-                else:
-                    error_msg = f"Creativity analysis failed for {media_type} - no output file"
-                    print(f"    [ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-            except Exception as e:
-                error_msg = f"Creativity analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-        
-        # Key Advantages Analysis
-        if f"{media_type}_key_advantages" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_key_advantages"]:
-            try:
-                print("  - Key Advantages Analysis...")
-                ka_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, "key_advantages", media_type)
-                
-                # Use appropriate function based on media type
-                if media_type == "ads":
-                    ka_output = analyze_ads_key_advantages(ANALYSIS_YEAR, ANALYSIS_MONTH, ka_folder)
-                else:
-                    print(f"    [SKIP] Key Advantages analysis not implemented for {media_type}")
-                    continue
-                
-                results["analyses"][media_type]["key_advantages"] = ka_output
-                print(f"    ✅ Saved: {os.path.basename(ka_output)}")
-            except Exception as e:
-                error_msg = f"Key Advantages analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-        
-        # Content Pillars Analysis
-        if f"{media_type}_content_pillars" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_content_pillars"]:
-            try:
-                print("  - Content Pillars Analysis...")
-                content_pillars_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, "content_pillars", media_type)
-                
-                # Use appropriate function based on media type
-                if media_type == "social_media":
-                    content_pillars_output = analyze_social_content_pillars(ANALYSIS_YEAR, ANALYSIS_MONTH, content_pillars_folder)
-                else:
-                    print(f"    ⏸️  Content Pillars analysis not implemented for {media_type}")
-                    continue
-                
-                if content_pillars_output:
-                    results["analyses"][media_type]["content_pillars"] = content_pillars_output
-                    print(f"    ✅ Saved: {os.path.basename(content_pillars_output)}")
-                else:
-                    error_msg = f"Content Pillars analysis failed for {media_type}"
-                    print(f"    [ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Content Pillars analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-        
-        # Audience Affinity Analysis
-        if f"{media_type}_audience_affinity" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_audience_affinity"]:
-            try:
-                print("  - Audience Affinity Analysis...")
-                audience_affinity_folder = ensure_analysis_folder(ANALYSIS_YEAR, ANALYSIS_MONTH, "audience_affinity", media_type)
-                
-                # Use appropriate function based on media type
-                if media_type == "social_media":
-                    audience_affinity_output = analyze_social_audience_affinity(ANALYSIS_YEAR, ANALYSIS_MONTH, audience_affinity_folder)
-                else:
-                    print(f"    ⏸️  Audience Affinity analysis not implemented for {media_type}")
-                    continue
-                
-                if audience_affinity_output:
-                    results["analyses"][media_type]["audience_affinity"] = audience_affinity_output
-                    print(f"    ✅ Saved: {os.path.basename(audience_affinity_output)}")
-                else:
-                    error_msg = f"Audience Affinity analysis failed for {media_type}"
-                    print(f"    [ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Audience Affinity analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
-        
-        # Agility Analysis (PR only)
-        if f"{media_type}_agility" in ANALYSIS_CONTROL and ANALYSIS_CONTROL[f"{media_type}_agility"]:
-            try:
-                print("  - Agility Data Merge...")
-                
-                # Use appropriate function based on media type
-                if media_type == "pr":
-                    agility_output = analyze_pr_agility(ANALYSIS_YEAR, ANALYSIS_MONTH)
-                else:
-                    print(f"    [SKIP] Agility analysis not implemented for {media_type}")
-                    continue
-                
-                if agility_output:
-                    results["analyses"][media_type]["agility"] = agility_output
-                    results["processed_data"][media_type] = agility_output  # Mark as processed data
-                    print(f"    [OK] Saved: {os.path.basename(agility_output)}")
-                else:
-                    error_msg = f"Agility analysis failed for {media_type}"
-                    print(f"    [ERROR] {error_msg}")
-                    results["errors"].append(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"Agility analysis failed for {media_type}: {e}"
-                print(f"    [ERROR] {error_msg}")
-                results["errors"].append(error_msg)
+    # Media types are independent (own files, folders and API calls), so process them concurrently
+    with ThreadPoolExecutor(max_workers=len(media_types_to_process)) as executor:
+        for media_results in executor.map(process_media_type, media_types_to_process):
+            results["processed_data"].update(media_results["processed_data"])
+            results["analyses"].update(media_results["analyses"])
+            results["errors"].extend(media_results["errors"])
     
     # Summary
     print("\n" + "=" * 60)
@@ -9,30 +9,34 @@ import sys
 import shutil
 import subprocess
 
+# Folders that never hold this project's bytecode cache
+SKIP_DIRS = {'.git', '.venv', 'venv', 'node_modules'}
+
 def clear_python_cache():
     """Clear all Python cache files in the current directory and subdirectories."""
     print("[CLEAN] Clearing Python cache...")
     
-    # Remove .pyc files
+    # One walk: remove .pyc files as they are found and each __pycache__ folder once emptied
+    removed_files = 0
+    removed_dirs = 0
     for root, dirs, files in os.walk('.'):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for file in files:
             if file.endswith('.pyc'):
                 try:
                     os.remove(os.path.join(root, file))
-                    print(f"  Removed: {os.path.join(root, file)}")
-                except:
-                    pass
-    
-    # Remove __pycache__ directories
-    for root, dirs, files in os.walk('.'):
-        for dir_name in dirs:
-            if dir_name == '__pycache__':
-                try:
-                    shutil.rmtree(os.path.join(root, dir_name))
-                    print(f"  Removed: {os.path.join(root, dir_name)}")
+                    removed_files += 1
                 except:
                     pass
+        if os.path.basename(root) == '__pycache__':
+            dirs[:] = []
+            try:
+                shutil.rmtree(root)
+                removed_dirs += 1
+            except:
+                pass
     
+    print(f"  Removed {removed_files} .pyc files and {removed_dirs} __pycache__ folders")
     print("[OK] Cache cleared!")
 
 def main():
@@ -3,10 +3,55 @@ Data processing utilities for monthly dashboard
 """
 import pandas as pd
 import os
+import threading
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from config import MEDIA_TYPES
 from .folder_manager import get_new_data_path, get_dashboard_data_path
-from .timezone_fix import remove_timezone_from_dataframe, safe_to_datetime
+from .timezone_fix import remove_timezone_from_dataframe_inplace, safe_to_datetime
+
+def _parquet_path(file_path: str) -> str:
+    """Path of the Parquet copy kept next to an Excel file"""
+    return os.path.splitext(file_path)[0] + ".parquet"
+
+def _write_parquet_copy(df: pd.DataFrame, file_path: str) -> None:
+    """
+    Write the Parquet copy of an Excel file; failures (e.g. no pyarrow) are ignored
+    The copy is written under a per-process/thread name and renamed into place, so a
+    concurrent reader never opens a half-written file
+    """
+    parquet_path = _parquet_path(file_path)
+    tmp_path = f"{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_table(file_path: str) -> pd.DataFrame:
+    """
+    Read an Excel file, using the Parquet copy next to it when that copy is up to date.
+    The copy is (re)written on a workbook read; without pyarrow the workbook is read every time.
+    """
+    parquet_path = _parquet_path(file_path)
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception:
+            pass
+    
+    df = pd.read_excel(file_path)
+    _write_parquet_copy(df, file_path)
+    return df
+
+def write_table(df: pd.DataFrame, file_path: str) -> None:
+    """
+    Save a DataFrame as Excel plus a Parquet copy, so the next read skips the workbook parse
+    """
+    df.to_excel(file_path, index=False)
+    # If the copy cannot be written, the one left behind is older than the workbook and read_table ignores it
+    _write_parquet_copy(df, file_path)
 
 def load_new_data(media_type: str, year: int = None, month: int = None) -> pd.DataFrame:
     """
@@ -21,11 +66,21 @@ def load_new_data(media_type: str, year: int = None, month: int = None) -> pd.Da
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Master file not found: {file_path}")
     
+    # Every analysis of a run loads the same month; parse it once and hand out copies, since callers modify their frame
+    return _load_new_data_cached(media_type, file_path, year, month, os.path.getmtime(file_path)).copy()
+
+@lru_cache(maxsize=8)
+def _load_new_data_cached(media_type: str, file_path: str, year: Optional[int], month: Optional[int],
+                          mtime: float) -> pd.DataFrame:
+    """
+    Cached worker for load_new_data; mtime is part of the key so an updated master file is re-read
+    """
     # Load the data
-    df = pd.read_excel(file_path)
+    df = read_table(file_path)
     
-    # Clean datetime columns to remove timezone information (prevents Excel export errors)
-    df = remove_timezone_from_dataframe(df)
+    # Clean datetime columns to remove timezone information (prevents Excel export errors);
+    # the frame was just read, so its columns are replaced in place
+    df = remove_timezone_from_dataframe_inplace(df)
     
     # Filter by month if year and month are specified
     if year is not None and month is not None:
@@ -48,7 +103,7 @@ def load_existing_dashboard_data(year: int, month: int, media_type: str) -> Opti
     if not os.path.exists(master_file):
         return None
     
-    return pd.read_excel(master_file)
+    return read_table(master_file)
 
 def append_monthly_data(year: int, month: int, media_type: str, 
                        new_data: pd.DataFrame, overwrite: bool = False) -> str:
@@ -56,14 +111,15 @@ def append_monthly_data(year: int, month: int, media_type: str,
     Append new monthly data to dashboard data
     Returns path to saved file
     """
-    # Add month and year columns to new data
-    new_data = new_data.copy()
-    new_data['year'] = year
-    new_data['month'] = month
-    new_data['analysis_date'] = pd.Timestamp.now().tz_localize(None)  # Ensure timezone-naive
+    # Add month and year columns to new data (assign returns a new frame, the caller's is untouched)
+    new_data = new_data.assign(
+        year=year,
+        month=month,
+        analysis_date=pd.Timestamp.now().tz_localize(None)  # Ensure timezone-naive
+    )
     
-    # Load existing data if it exists
-    existing_data = load_existing_dashboard_data(year, month, media_type)
+    # Load existing data if it exists (not needed when overwriting)
+    existing_data = None if overwrite else load_existing_dashboard_data(year, month, media_type)
     
     if existing_data is not None and not overwrite:
         # Append new data to existing
@@ -81,10 +137,9 @@ def append_monthly_data(year: int, month: int, media_type: str,
     
     output_file = os.path.join(folder_path, f"{media_type}_master_data.xlsx")
     
-    # Clean all datetime columns to remove timezone information before saving
-    data_to_save = remove_timezone_from_dataframe(combined_data)
-    
-    data_to_save.to_excel(output_file, index=False)
+    # Clean all datetime columns to remove timezone information before saving;
+    # combined_data is a frame built here (assign/concat), so no copy is needed
+    write_table(remove_timezone_from_dataframe_inplace(combined_data), output_file)
     
     return output_file
 
@@ -114,17 +169,13 @@ def filter_data_by_month(df: pd.DataFrame, year: int, month: int,
     # For ads, prioritize startDateFormatted (start date only)
     if 'startDateFormatted' in available_date_columns:
         try:
-            df_temp = df.copy()
-            df_temp['startDateFormatted'] = safe_to_datetime(df_temp['startDateFormatted'], utc=True)
+            start_dates = safe_to_datetime(df['startDateFormatted'], utc=True)
             
             # Filter by start date year and month only
-            month_mask = (
-                (df_temp['startDateFormatted'].dt.year == year) & 
-                (df_temp['startDateFormatted'].dt.month == month)
-            )
+            month_mask = (start_dates.dt.year == year) & (start_dates.dt.month == month)
             
             if month_mask.any():
-                filtered_df = df_temp[month_mask].copy()
+                filtered_df = df[month_mask].assign(startDateFormatted=start_dates[month_mask])
                 print(f"Found {len(filtered_df)} items with start date in {year}-{month:02d}")
                 return filtered_df
             else:
@@ -134,36 +185,30 @@ def filter_data_by_month(df: pd.DataFrame, year: int, month: int,
         except Exception as e:
             print(f"Error filtering by startDateFormatted: {e}")
     
-    # For other media types, try all available date columns
-    filtered_dfs = []
+    # For other media types, keep rows whose date falls in the month in any available date column
+    month_mask = pd.Series(False, index=df.index)
+    parsed_columns = {}
     for date_col in available_date_columns:
         try:
-            # Convert date column to datetime
-            df_temp = df.copy()
-            df_temp[date_col] = safe_to_datetime(df_temp[date_col], utc=True)
-            
-            # Filter by year and month
-            month_mask = (
-                (df_temp[date_col].dt.year == year) & 
-                (df_temp[date_col].dt.month == month)
-            )
+            dates = safe_to_datetime(df[date_col], utc=True)
+            col_mask = (dates.dt.year == year) & (dates.dt.month == month)
             
-            if month_mask.any():
-                filtered_df = df_temp[month_mask].copy()
-                filtered_dfs.append(filtered_df)
-                print(f"Found {len(filtered_df)} items in {date_col} for {year}-{month:02d}")
+            if col_mask.any():
+                month_mask |= col_mask
+                parsed_columns[date_col] = dates
+                print(f"Found {col_mask.sum()} items in {date_col} for {year}-{month:02d}")
         except Exception as e:
             print(f"Error filtering by {date_col}: {e}")
             continue
     
-    if filtered_dfs:
-        # Combine all filtered dataframes and remove duplicates
-        combined_df = pd.concat(filtered_dfs, ignore_index=True)
+    if month_mask.any():
+        # One selection over the combined mask, with the matching date columns parsed
+        combined_df = df[month_mask].assign(**{col: dates[month_mask] for col, dates in parsed_columns.items()})
         # Remove duplicates based on text content if available
         text_cols = [col for col in df.columns if 'text' in col.lower() or 'content' in col.lower()]
         if text_cols:
             combined_df = combined_df.drop_duplicates(subset=text_cols[0], keep='first')
-        return combined_df
+        return combined_df.reset_index(drop=True)
     else:
         print(f"Warning: No data found for {year}-{month:02d}. Analyzing all data.")
         return df
@@ -198,10 +243,10 @@ def validate_data_structure(df: pd.DataFrame, media_type: str) -> Dict[str, Any]
         text_col = media_config["text_column"]
         brand_col = media_config["brand_column"]
         
-        empty_mask = df[text_col].isna() | df[brand_col].isna()
-        validation["empty_rows"] = empty_mask.sum()
-        
-        if validation["empty_rows"] > 0:
+        # Test the text column first and only count rows when something is actually missing
+        text_missing = df[text_col].isna()
+        if text_missing.any() or df[brand_col].hasnans:
+            validation["empty_rows"] = int((text_missing | df[brand_col].isna()).sum())
             validation["valid"] = False
     
     return validation
@@ -217,19 +262,24 @@ def clean_data(df: pd.DataFrame, media_type: str) -> pd.DataFrame:
     brand_col = media_config["brand_column"]
     reach_col = media_config["reach_column"]
     
+    # Build one keep-mask over all checks and select once, instead of re-filtering per check
+    keep = pd.Series(True, index=df.index)
+    cleaned_columns = {}
+    
     # Clean text data
     if text_col in df.columns:
-        df[text_col] = df[text_col].astype(str).str.strip()
-        df = df[df[text_col] != 'nan']
-        df = df[df[text_col] != '']
+        text = df[text_col].astype(str).str.strip()
+        keep &= (text != 'nan') & (text != '')
+        cleaned_columns[text_col] = text
     
     # Clean brand data
     if brand_col in df.columns:
-        df = df[df[brand_col].notna()]
+        keep &= df[brand_col].notna()
     
     # Clean reach data
     if reach_col in df.columns:
-        df[reach_col] = pd.to_numeric(df[reach_col], errors='coerce')
-        df = df[df[reach_col].notna()]
+        reach = pd.to_numeric(df[reach_col], errors='coerce')
+        keep &= reach.notna()
+        cleaned_columns[reach_col] = reach
     
-    return df.reset_index(drop=True)
+    return df[keep].assign(**{col: values[keep] for col, values in cleaned_columns.items()}).reset_index(drop=True)
@@ -2,36 +2,69 @@
 Folder management utilities for monthly dashboard
 """
 import os
+import re
 import shutil
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from config import DASHBOARD_DATA_DIR, NEW_DATA_DIR, get_month_folder_name
 
+# YYYY-MM month folder names
+_MONTH_FOLDER_RE = re.compile(r"\d{4}-\d{2}")
+
+# media_type/analysis/analysis_type folders created under every month folder
+_ANALYSIS_SUBFOLDERS = tuple(
+    os.path.join(media_type, "analysis", analysis_type)
+    for media_type in ["ads", "social_media", "pr"]
+    for analysis_type in ["compos", "creativity", "key_advantages", "content_pillars", "audience_affinity"]
+)
+
+# Folders already created by this process; clear() it if folders are deleted while running (e.g. in tests)
+_created = set()
+
+def _makedirs(path: str) -> None:
+    """
+    os.makedirs(path, exist_ok=True), skipped for folders this process already created
+    """
+    if path in _created:
+        return
+    os.makedirs(path, exist_ok=True)
+    _created.add(path)
+
 def create_monthly_folders(year: int, month: int) -> dict:
     """
     Create folder structure for a specific month
     Returns dict with created folder paths
     """
-    month_folder = get_month_folder_name(year, month)
-    
-    folders = {
-        "month_root": os.path.join(DASHBOARD_DATA_DIR, month_folder),
-        "ads": os.path.join(DASHBOARD_DATA_DIR, month_folder, "ads"),
-        "social_media": os.path.join(DASHBOARD_DATA_DIR, month_folder, "social_media"),
-        "pr": os.path.join(DASHBOARD_DATA_DIR, month_folder, "pr"),
-    }
-    
-    # Create all media type folders
-    for folder_path in folders.values():
-        os.makedirs(folder_path, exist_ok=True)
+    return dict(_create_monthly_folders_cached(year, month))
+
+@lru_cache(maxsize=64)
+def _create_monthly_folders_cached(year: int, month: int) -> tuple:
+    """
+    Create the month's folders once per process; returns the (name, path) pairs
+    """
+    folders = compute_monthly_folders(year, month)
     
-    # Create analysis subfolders for each media type
-    analysis_types = ["compos", "creativity", "key_advantages", "content_pillars", "audience_affinity"]
-    for media_type in ["ads", "social_media", "pr"]:
-        for analysis_type in analysis_types:
-            analysis_folder = os.path.join(folders[media_type], "analysis", analysis_type)
-            os.makedirs(analysis_folder, exist_ok=True)
+    # Create the analysis subfolders for each media type; makedirs creates the month and
+    # media type folders on the way, so they need no calls of their own
+    for analysis_folder in _ANALYSIS_SUBFOLDERS:
+        _makedirs(os.path.join(folders["month_root"], analysis_folder))
     
-    return folders
+    return tuple(folders.items())
+
+def compute_monthly_folders(year: int, month: int) -> dict:
+    """
+    Folder paths for a specific month, without creating anything
+    Writers create the folder they save into (os.makedirs / ensure_analysis_folder)
+    """
+    month_root = os.path.join(DASHBOARD_DATA_DIR, get_month_folder_name(year, month))
+    return {
+        "month_root": month_root,
+        "ads": os.path.join(month_root, "ads"),
+        "social_media": os.path.join(month_root, "social_media"),
+        "pr": os.path.join(month_root, "pr"),
+    }
 
 def get_monthly_folders(year: int, month: int) -> dict:
     """
@@ -39,6 +72,14 @@ def get_monthly_folders(year: int, month: int) -> dict:
     """
     return create_monthly_folders(year, month)
 
+def create_months_bulk(months: List[Tuple[int, int]]) -> List[dict]:
+    """
+    Create folder structures for several (year, month) pairs, e.g. for a backfill
+    Months are created concurrently since the work is waiting on mkdir calls
+    """
+    with ThreadPoolExecutor(max_workers=min(8, len(months) or 1)) as executor:
+        return list(executor.map(lambda ym: create_monthly_folders(*ym), months))
+
 def list_available_months() -> List[str]:
     """
     List all available months in dashboard_data
@@ -46,11 +87,11 @@ def list_available_months() -> List[str]:
     if not os.path.exists(DASHBOARD_DATA_DIR):
         return []
     
-    months = []
-    for item in os.listdir(DASHBOARD_DATA_DIR):
-        item_path = os.path.join(DASHBOARD_DATA_DIR, item)
-        if os.path.isdir(item_path) and len(item) == 7 and item[4] == '-':
-            months.append(item)
+    # scandir entries carry their file type, so is_dir() needs no extra stat per entry;
+    # the name pattern is checked first, so hidden and other non-month entries are never type-checked
+    with os.scandir(DASHBOARD_DATA_DIR) as entries:
+        months = [entry.name for entry in entries
+                  if _MONTH_FOLDER_RE.fullmatch(entry.name) and entry.is_dir()]
     
     return sorted(months)
 
@@ -67,18 +108,21 @@ def get_dashboard_data_path(year: int, month: int, media_type: str) -> str:
     month_folder = get_month_folder_name(year, month)
     return os.path.join(DASHBOARD_DATA_DIR, month_folder, media_type)
 
-def backup_existing_file(file_path: str) -> Optional[str]:
+def backup_existing_file(file_path: str, preserve_metadata: bool = False) -> Optional[str]:
     """
     Create backup of existing file with timestamp
     Returns backup file path or None if no backup needed
+    Only the file contents are copied unless preserve_metadata is set
     """
     if not os.path.exists(file_path):
         return None
     
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     backup_path = f"{file_path}.backup_{timestamp}"
-    shutil.copy2(file_path, backup_path)
+    if preserve_metadata:
+        shutil.copy2(file_path, backup_path)
+    else:
+        shutil.copyfile(file_path, backup_path)
     return backup_path
 
 def ensure_analysis_folder(year: int, month: int, analysis_type: str, media_type: str = None) -> str:
@@ -94,5 +138,5 @@ def ensure_analysis_folder(year: int, month: int, analysis_type: str, media_type
         # Legacy structure: analysis/analysis_type (for backward compatibility)
         analysis_folder = os.path.join(DASHBOARD_DATA_DIR, month_folder, "analysis", analysis_type)
     
-    os.makedirs(analysis_folder, exist_ok=True)
+    _makedirs(analysis_folder)
     return analysis_folder
@@ -7,33 +7,46 @@ before saving to Excel files, preventing Excel export errors.
 import pandas as pd
 
 
+def _tz_aware_columns(df: pd.DataFrame) -> list:
+    """Names of the timezone-aware datetime columns of a DataFrame."""
+    return [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.DatetimeTZDtype)]
+
+
 def remove_timezone_from_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove timezone information from all datetime columns in a DataFrame.
-    This prevents Excel export errors while preserving the datetime values.
+    This prevents Excel export errors; values are kept as the same instants in UTC.
     
     Args:
         df: pandas DataFrame
         
     Returns:
         DataFrame with timezone information removed from datetime columns
+        (the input itself when no column is timezone-aware)
+    """
+    # Only timezone-aware columns need work; without any, the frame is returned as is (no copy)
+    if not _tz_aware_columns(df):
+        return df
+    
+    return remove_timezone_from_dataframe_inplace(df.copy())
+
+
+def remove_timezone_from_dataframe_inplace(df: pd.DataFrame) -> pd.DataFrame:
     """
-    df_clean = df.copy()
+    Same as remove_timezone_from_dataframe, but replaces the columns of df itself.
+    Use it for frames the caller owns, e.g. one that is written to Excel and discarded.
     
-    for col in df_clean.columns:
-        if df_clean[col].dtype.name.startswith('datetime64'):
-            try:
-                # Check if column has timezone info
-                if df_clean[col].dtype.name == 'datetime64[ns, UTC]':
-                    df_clean[col] = df_clean[col].dt.tz_localize(None)
-                elif hasattr(df_clean[col].dtype, 'tz') and df_clean[col].dtype.tz is not None:
-                    df_clean[col] = df_clean[col].dt.tz_localize(None)
-                # If it's already timezone-naive, leave it as is
-            except Exception as e:
-                print(f"Warning: Could not remove timezone from column '{col}': {e}")
-                continue
+    Args:
+        df: pandas DataFrame (modified)
+        
+    Returns:
+        df, with timezone information removed from datetime columns
+    """
+    # Convert to UTC and drop the zone in one step; this reuses the stored int64 instants and cannot fail
+    for col in _tz_aware_columns(df):
+        df[col] = df[col].dt.tz_convert(None)
     
-    return df_clean
+    return df
 
 
 def safe_to_datetime(series: pd.Series, utc: bool = False) -> pd.Series:
@@ -47,13 +60,17 @@ def safe_to_datetime(series: pd.Series, utc: bool = False) -> pd.Series:
     Returns:
         Series converted to datetime with timezone information removed
     """
+    if series.dtype.kind == 'M':
+        # Already datetimes: no parsing, only drop the zone when UTC output was asked for
+        if utc and isinstance(series.dtype, pd.DatetimeTZDtype):
+            return series.dt.tz_convert(None)
+        return series
+    
+    # errors='coerce' turns bad values into NaT; the try only guards inputs to_datetime rejects as a whole
     try:
         if utc:
-            # Parse as UTC first, then remove timezone
-            dt_series = pd.to_datetime(series, errors='coerce', utc=True)
-            if dt_series.dtype.name == 'datetime64[ns, UTC]':
-                return dt_series.dt.tz_localize(None)
-            return dt_series
+            # Parse as UTC first, then remove timezone (utc=True always yields a UTC dtype, whatever the unit)
+            return pd.to_datetime(series, errors='coerce', utc=True).dt.tz_convert(None)
         else:
             # Parse as timezone-naive
             return pd.to_datetime(series, errors='coerce')